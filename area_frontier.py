@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Build the crawl frontier from the dashboard's area hierarchy.
+
+Areas come from /api/getArea?isDashboard=true (scrape_parakh.get_area_data)
+and are cached in area_data.json with a TTL, so new states/UTs are picked up
+without code changes and areas that don't exist are never requested.
+
+The frontier is a deduplicated priority queue: states first, then (optionally)
+district-level dashboards. area_parents() maps each district area to its
+state, and cached_state_codes() gives State_Code lookups from the cache
+without Playwright, for convert_group_to_csv.py.
+
+Usage:
+    python area_frontier.py [--refresh] [--districts]
+"""
+import asyncio
+import heapq
+import json
+import os
+import re
+import sys
+import time
+from functools import lru_cache
+
+from profiling import start_from_argv
+
+CACHE_FILE = 'area_data.json'
+CACHE_TTL = 24 * 3600
+
+STATE_CODE = re.compile(r'^IND\d{2}$')
+DISTRICT_CODE = re.compile(r'^IND\d{3,}$')
+
+# Priorities (lower runs first)
+STATE_PRIORITY = 0
+DISTRICT_PRIORITY = 10
+
+CODE_KEYS = ('areaCode', 'area_code', 'areaId', 'area_id', 'code', 'id')
+NAME_KEYS = ('areaName', 'area_name', 'name', 'title')
+
+def _first(item, keys):
+    for key in keys:
+        value = item.get(key)
+        if isinstance(value, dict):
+            value = value.get('en')
+        if value not in (None, ''):
+            return str(value).strip()
+    return None
+
+def parse_areas(area_data):
+    """Flatten the getArea response into [{code, name, level, parent}]."""
+    areas = {}
+
+    def walk(node, parent=None):
+        if isinstance(node, list):
+            for item in node:
+                walk(item, parent)
+            return
+        if not isinstance(node, dict):
+            return
+        code = _first(node, CODE_KEYS)
+        name = _first(node, NAME_KEYS)
+        if code and STATE_CODE.match(code):
+            level = 'state'
+        elif code and DISTRICT_CODE.match(code):
+            level = 'district'
+        else:
+            level = None
+        if level and code not in areas:
+            areas[code] = {'code': code, 'name': name or code, 'level': level,
+                           'parent': parent if level == 'district' else 'IND'}
+        for value in node.values():
+            if isinstance(value, (list, dict)):
+                walk(value, code if level == 'state' else parent)
+
+    walk(area_data.get('data', area_data) if isinstance(area_data, dict) else area_data)
+
+    # Districts without a nested parent get it from their code prefix
+    for area in areas.values():
+        if area['level'] == 'district' and not area['parent']:
+            area['parent'] = area['code'][:5]
+    return sorted(areas.values(), key=lambda a: a['code'])
+
+async def load_areas(page=None, ttl=CACHE_TTL, refresh=False):
+    """Areas from the cache, or fetched from getArea when stale or missing."""
+    if not refresh and os.path.exists(CACHE_FILE):
+        with open(CACHE_FILE, 'r') as f:
+            cached = json.load(f)
+        if 'fetched_at' in cached and time.time() - cached['fetched_at'] < ttl:
+            return parse_areas(cached['response'])
+
+    from scrape_parakh import get_area_data
+
+    if page is None:
+        from playwright.async_api import async_playwright
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+            await page.goto("https://dashboard.parakh.ncert.gov.in/en", wait_until="networkidle", timeout=60000)
+            response = await get_area_data(page)
+            await browser.close()
+    else:
+        response = await get_area_data(page)
+
+    with open(CACHE_FILE, 'w') as f:
+        json.dump({'fetched_at': time.time(), 'response': response}, f, indent=2)
+    return parse_areas(response)
+
+def area_parents(areas):
+    """{district_code: (state_code, state_name)} for district-level areas."""
+    names = {a['code']: a['name'] for a in areas if a['level'] == 'state'}
+    return {a['code']: (a['parent'], names.get(a['parent'], a['parent']))
+            for a in areas if a['level'] == 'district'}
+
+@lru_cache(maxsize=None)
+def cached_state_codes(cache_file=CACHE_FILE):
+    """{state name: state code} from the cached getArea response, ignoring the TTL."""
+    if not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file, 'r') as f:
+            response = json.load(f)['response']
+    except (OSError, ValueError, KeyError):
+        return {}
+    return {a['name']: a['code'] for a in parse_areas(response) if a['level'] == 'state'}
+
+class Frontier:
+    """Deduplicated priority queue of areas to crawl."""
+
+    def __init__(self):
+        self._heap = []
+        self._seen = set()
+        self._counter = 0
+
+    def push(self, area, priority):
+        """Queue an area unless it was queued before. Returns True if added."""
+        if area['code'] in self._seen:
+            return False
+        self._seen.add(area['code'])
+        heapq.heappush(self._heap, (priority, self._counter, area))
+        self._counter += 1
+        return True
+
+    def pop(self):
+        return heapq.heappop(self._heap)[2]
+
+    def __len__(self):
+        return len(self._heap)
+
+def build_frontier(areas, include_districts=False, skip=()):
+    """Frontier with every state and, optionally, every district dashboard."""
+    frontier = Frontier()
+    for area in areas:
+        if area['code'] in skip:
+            continue
+        if area['level'] == 'state':
+            frontier.push(area, STATE_PRIORITY)
+        elif include_districts:
+            frontier.push(area, DISTRICT_PRIORITY)
+    return frontier
+
+async def main():
+    args = sys.argv[1:]
+    if any(a not in ('--refresh', '--districts') for a in args):
+        print("Usage: python area_frontier.py [--refresh] [--districts]")
+        sys.exit(1)
+
+    areas = await load_areas(refresh='--refresh' in args)
+    frontier = build_frontier(areas, include_districts='--districts' in args)
+    states = sum(1 for a in areas if a['level'] == 'state')
+    print(f"Areas: {states} states, {len(areas) - states} districts")
+    print(f"Frontier: {len(frontier)} areas")
+    while frontier:
+        area = frontier.pop()
+        print(f"  {area['code']}  {area['name']}")
+
+if __name__ == "__main__":
+    start_from_argv()
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for parakh.py.
+
+Times `python parakh.py --help` and each subcommand's --help in fresh
+interpreters, and checks that importing parakh pulls in none of the heavy
+modules. Exits non-zero if the median exceeds the budget or a heavy module
+is imported eagerly.
+
+Usage:
+    python bench_startup.py [--runs 10] [--budget-ms 150]
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ['pandas', 'numpy', 'playwright', 'matplotlib']
+COMMANDS = [[], ['scrape'], ['convert'], ['combine'], ['finalize'], ['validate']]
+
+def time_command(cmd, runs):
+    """Median wall time of `cmd` in ms."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def eager_imports():
+    code = ("import sys, parakh; parakh.build_parser(); "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True).stdout.strip()
+    return [m for m in out.split(',') if m]
+
+def main():
+    args = sys.argv[1:]
+    runs = int(args[args.index('--runs') + 1]) if '--runs' in args else 10
+    budget = float(args[args.index('--budget-ms') + 1]) if '--budget-ms' in args else 150
+
+    baseline = time_command([sys.executable, '-c', 'pass'], runs)
+    print(f"Bare interpreter: {baseline:.1f} ms")
+
+    worst = 0
+    for argv in COMMANDS:
+        median = time_command([sys.executable, 'parakh.py'] + argv + ['--help'], runs)
+        worst = max(worst, median)
+        print(f"  parakh {' '.join(argv + ['--help']):22s} {median:7.1f} ms")
+
+    heavy = eager_imports()
+    ok = worst <= budget and not heavy
+    if heavy:
+        print(f"✗ Heavy modules imported at startup: {', '.join(heavy)}")
+    if worst > budget:
+        print(f"✗ Slowest --help took {worst:.1f} ms (budget {budget:.0f} ms)")
+    if ok:
+        print(f"✓ Startup within budget ({worst:.1f} / {budget:.0f} ms)")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Precompute national rankings and percentiles from the 3 stage CSVs.
+
+Run after create_final_csvs.py / combine_all_csvs.py. Writes indexed artifacts
+so dashboards and reports can read them directly instead of re-grouping:
+1. district_rankings.csv - rank/percentile of each district per (Stage, Subject, LO_Code)
+2. state_stats.csv       - state mean/median/stdev per (Stage, Subject) + national percentile
+3. subject_rollups.csv   - district mean per (Stage, Subject) + national rank/percentile
+
+Each file is sorted by its index columns (see INDEXES); use load_index() to read
+one back with the index set.
+"""
+import pandas as pd
+import sys
+from profiling import start_from_argv
+
+STAGE_FILES = {
+    'Foundational Stage': 'foundational_stage.csv',
+    'Preparatory Stage': 'preparatory_stage.csv',
+    'Middle Stage': 'middle_stage.csv'
+}
+
+# Index columns of each artifact
+INDEXES = {
+    'district_rankings.csv': ['Stage', 'Subject', 'LO_Code', 'State', 'District'],
+    'state_stats.csv': ['Stage', 'Subject', 'State'],
+    'subject_rollups.csv': ['Stage', 'Subject', 'State', 'District']
+}
+
+def load_stages(stage_files=STAGE_FILES):
+    """Load the stage CSVs into one long frame with a Stage column."""
+    frames = []
+    for stage, filename in stage_files.items():
+        df = pd.read_csv(filename)
+        df.insert(0, 'Stage', stage)
+        frames.append(df)
+    df = pd.concat(frames, ignore_index=True)
+    df['Stage'] = df['Stage'].astype('category')
+    return df
+
+def district_rankings(df):
+    """Rank every district nationally within each (Stage, Subject, LO_Code).
+
+    LO codes are only unique within a subject (C-1.1 is a different
+    competency in Language and in Science), so Subject is part of the key.
+    """
+    out = df[['Stage', 'Subject', 'LO_Code', 'State', 'District', 'Score']].copy()
+    grouped = out.groupby(['Stage', 'Subject', 'LO_Code'], observed=True)['Score']
+    out['National_Rank'] = grouped.rank(ascending=False, method='min').astype(int)
+    out['National_Percentile'] = (grouped.rank(pct=True) * 100).round(2)
+    out['State_Rank'] = (out.groupby(['Stage', 'Subject', 'LO_Code', 'State'], observed=True)['Score']
+                         .rank(ascending=False, method='min').astype(int))
+    out['LO_Mean'] = grouped.transform('mean').round(2)
+    out['Delta_From_Mean'] = (out['Score'] - out['LO_Mean']).round(2)
+    return out
+
+def state_stats(df):
+    """State mean/median/stdev per subject, with national percentile of the mean."""
+    stats = (df.groupby(['Stage', 'Subject', 'State'], observed=True)
+             .agg(Mean=('Score', 'mean'), Median=('Score', 'median'), Stdev=('Score', 'std'),
+                  Min=('Score', 'min'), Max=('Score', 'max'), Rows=('Score', 'count'),
+                  Districts=('District', 'nunique'))
+             .reset_index())
+    grouped = stats.groupby(['Stage', 'Subject'], observed=True)['Mean']
+    stats['National_Rank'] = grouped.rank(ascending=False, method='min').astype(int)
+    stats['National_Percentile'] = (grouped.rank(pct=True) * 100).round(2)
+    return stats.round({'Mean': 2, 'Median': 2, 'Stdev': 2})
+
+def subject_rollups(df):
+    """District mean per subject, ranked nationally and within state."""
+    rollup = (df.groupby(['Stage', 'Subject', 'State', 'District'], observed=True)['Score']
+              .agg(Mean='mean', Competencies='count')
+              .reset_index())
+    grouped = rollup.groupby(['Stage', 'Subject'], observed=True)['Mean']
+    rollup['National_Rank'] = grouped.rank(ascending=False, method='min').astype(int)
+    rollup['National_Percentile'] = (grouped.rank(pct=True) * 100).round(2)
+    rollup['State_Rank'] = (rollup.groupby(['Stage', 'Subject', 'State'], observed=True)['Mean']
+                            .rank(ascending=False, method='min').astype(int))
+    return rollup.round({'Mean': 2})
+
+def save_indexed(df, filename):
+    """Sort by the artifact's index columns and save."""
+    df = df.sort_values(INDEXES[filename])
+    df.to_csv(filename, index=False)
+    print(f"  ✓ {filename}: {len(df):,} rows")
+
+def load_index(filename):
+    """Load an artifact written by this script with its index set."""
+    return pd.read_csv(filename).set_index(INDEXES[filename]).sort_index()
+
+def build_rankings():
+    print("Building ranking index...")
+    print("=" * 60)
+
+    df = load_stages()
+    print(f"Loaded {len(df):,} rows across {df['Stage'].nunique()} stages")
+
+    save_indexed(district_rankings(df), 'district_rankings.csv')
+    save_indexed(state_stats(df), 'state_stats.csv')
+    save_indexed(subject_rollups(df), 'subject_rollups.csv')
+
+    print("=" * 60)
+    print("Done!")
+
+if __name__ == "__main__":
+    start_from_argv()
+    if len(sys.argv) != 1:
+        print("Usage: python build_rankings.py")
+        sys.exit(1)
+    build_rankings()
@@ -1,40 +1,60 @@
 #!/usr/bin/env python3
 """
 Combine all group CSVs into the main parakh_competency_data.csv
+
+With --from-json, all group*_results.json files are converted concurrently and
+combined in memory, skipping the group*_data.csv round-trip.
+
+The combined frame is validated before it is written; on failure the previous
+parakh_competency_data_all.csv is left in place and the script exits non-zero.
 """
+import glob
+import os
 import pandas as pd
 import sys
+from convert_group_to_csv import convert_all
+from district_registry import DistrictRegistry
+from validate_data import run_validation
+from profiling import start_from_argv
+
+OUTPUT_FILE = 'parakh_competency_data_all.csv'
 
-def combine_csvs():
-    """Combine existing CSV with new group CSVs."""
+def combine_csvs(group_frames=None):
+    """Combine existing CSV with new group CSVs (or in-memory group frames)."""
     
     # Load existing data
     main_df = pd.read_csv('parakh_competency_data.csv')
     print(f"Existing data: {len(main_df)} rows, {main_df['State'].nunique()} states")
     
     # Find all group CSVs
-    import glob
-    group_files = sorted(glob.glob('group*_data.csv'))
+    if group_frames is None:
+        group_frames = {f: None for f in sorted(glob.glob('group*_data.csv'))}
     
-    if not group_files:
-        print("No group CSV files found!")
+    if not group_frames:
+        print("No group files found!")
         return
     
-    print(f"\nFound {len(group_files)} group files:")
-    for f in group_files:
+    print(f"\nFound {len(group_frames)} group files:")
+    for f in group_frames:
         print(f"  {f}")
     
     # Combine all data
     all_dfs = [main_df]
     
-    for group_file in group_files:
-        df = pd.read_csv(group_file)
+    for group_file, df in group_frames.items():
+        if df is None:
+            df = pd.read_csv(group_file)
         print(f"\n{group_file}: {len(df)} rows, {df['State'].nunique()} states")
         all_dfs.append(df)
     
     # Concatenate
     combined = pd.concat(all_dfs, ignore_index=True)
     
+    # Canonicalize district spellings so duplicates line up
+    registry = DistrictRegistry.load()
+    combined = registry.canonicalize_frame(combined)
+    registry.save()
+    
     # Remove duplicates (keep last version)
     combined = combined.drop_duplicates(
         subset=['State', 'District', 'Stage', 'Competency_Code'],
@@ -48,11 +68,20 @@ def combine_csvs():
     combined = combined.sort_values(['State', 'District', '_stage_order', 'Competency_Code'])
     combined = combined.drop('_stage_order', axis=1)
     
-    # Save
-    combined.to_csv('parakh_competency_data_all.csv', index=False)
+    # Gate on data quality before anything downstream can see the file; the
+    # district baseline moves forward only on a clean run
+    report = run_validation(df=combined, update_baseline=True)
+    if not report['passed']:
+        print(f"\n✗ Validation failed, keeping the previous {OUTPUT_FILE}")
+        sys.exit(1)
+    
+    # Save through a temp file so readers never see a partial CSV
+    tmp = f"{OUTPUT_FILE}.{os.getpid()}.tmp"
+    combined.to_csv(tmp, index=False)
+    os.replace(tmp, OUTPUT_FILE)
     
     print(f"\n{'='*60}")
-    print(f"✓ Combined CSV saved: parakh_competency_data_all.csv")
+    print(f"✓ Combined CSV saved: {OUTPUT_FILE}")
     print(f"  Total rows: {len(combined):,}")
     print(f"  Total states: {combined['State'].nunique()}")
     print(f"  Total districts: {combined['District'].nunique()}")
@@ -65,4 +94,8 @@ def combine_csvs():
     print(f"{'='*60}")
 
 if __name__ == "__main__":
-    combine_csvs()
+    start_from_argv()
+    if '--from-json' in sys.argv[1:]:
+        combine_csvs(convert_all())
+    else:
+        combine_csvs()
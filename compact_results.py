@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory store for scrape_groups.py results.
+
+Every point becomes a row of integer ids into interned string tables plus a
+score, kept in typed arrays instead of one dict per point. Rows are flushed
+to a spill file every `chunk_size` points, so peak memory stays bounded by the
+chunk size and the (small) string tables, not by the size of the run.
+
+The final group{X}_results.json is streamed back out in the same record format
+convert_group_to_csv.py already reads.
+"""
+import json
+import os
+import sys
+from array import array
+
+# Columns kept per point, in spill-file order
+COLUMNS = ('state', 'stage', 'competency', 'district', 'title', 'series', 'state_code', 'area')
+
+class StringTable:
+    """Interns strings to small integer ids."""
+
+    __slots__ = ('ids', 'values')
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def intern(self, value):
+        value = sys.intern(value)
+        idx = self.ids.get(value)
+        if idx is None:
+            idx = len(self.values)
+            self.ids[value] = idx
+            self.values.append(value)
+        return idx
+
+    def __getitem__(self, idx):
+        return self.values[idx]
+
+    def __len__(self):
+        return len(self.values)
+
+class CompactResults:
+    """Array-backed point store that spills to disk in chunks."""
+
+    __slots__ = ('spill_path', 'chunk_size', 'tables', 'columns', 'scores',
+                 'xs', 'flushed', '_spill')
+
+    def __init__(self, spill_path, chunk_size=5000):
+        self.spill_path = spill_path
+        self.chunk_size = chunk_size
+        self.tables = {name: StringTable() for name in COLUMNS}
+        self.columns = {name: array('I') for name in COLUMNS}
+        self.scores = array('d')
+        self.xs = array('d')
+        self.flushed = 0
+        self._spill = open(spill_path, 'w')
+
+    def __len__(self):
+        return self.flushed + len(self.scores)
+
+    def add(self, state, stage, competency_code, title, series_name, district, score, x=0,
+            state_code='', area=None):
+        """Append one district point. `area` is (code, name) for district dashboards."""
+        area_code, area_name = area or ('', '')
+        values = (state, stage, competency_code, district, title, series_name or '', state_code or '',
+                  f"{area_code}\x1f{area_name}" if area else '')
+        for name, value in zip(COLUMNS, values):
+            self.columns[name].append(self.tables[name].intern(value))
+        self.scores.append(score)
+        self.xs.append(x if x is not None else 0)
+
+        if len(self.scores) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows to the spill file and reset the buffers."""
+        if not self.scores:
+            return
+        cols = [self.columns[name] for name in COLUMNS]
+        lines = []
+        for i in range(len(self.scores)):
+            row = [col[i] for col in cols]
+            row.append(self.scores[i])
+            row.append(self.xs[i])
+            lines.append(json.dumps(row, separators=(',', ':')))
+        self._spill.write('\n'.join(lines) + '\n')
+        self._spill.flush()
+
+        self.flushed += len(self.scores)
+        for name in COLUMNS:
+            self.columns[name] = array('I')
+        self.scores = array('d')
+        self.xs = array('d')
+
+    def iter_records(self):
+        """Yield records in the scrape_groups.py JSON format."""
+        self.flush()
+        with open(self.spill_path, 'r') as f:
+            for line in f:
+                row = json.loads(line)
+                state, stage, comp, district, title, series, state_code, area = (
+                    self.tables[name][idx] for name, idx in zip(COLUMNS, row))
+                score, x = row[len(COLUMNS)], row[len(COLUMNS) + 1]
+                if score.is_integer():
+                    score = int(score)
+                if x.is_integer():
+                    x = int(x)
+                record = {
+                    'state': state,
+                    'state_code': state_code,
+                    'stage': stage,
+                    'competency_code': comp,
+                    'chart_title': title,
+                    'series_name': series,
+                    'data': [{
+                        'name': {'userOptions': district, 'name': district, 'parent': None},
+                        'y': score,
+                        'x': x
+                    }]
+                }
+                if area:
+                    record['area_code'], record['area'] = area.split('\x1f', 1)
+                yield record
+
+    def write_json(self, filename):
+        """Stream all records to a JSON array file without materializing them."""
+        count = 0
+        with open(filename, 'w') as f:
+            f.write('[')
+            for record in self.iter_records():
+                f.write(',\n' if count else '\n')
+                f.write(json.dumps(record))
+                count += 1
+            f.write('\n]\n' if count else ']\n')
+        return count
+
+    def close(self, remove_spill=True):
+        """Close the spill file, optionally deleting it."""
+        if not self._spill.closed:
+            self._spill.close()
+        if remove_spill and os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
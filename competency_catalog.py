@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Versioned cache of the competency dropdown options per stage.
+
+The competency set for a stage is national, so the full dropdown walk
+(get_competency_dropdowns) only needs to run once per stage. The scraper takes
+a cheap fingerprint of each page's dropdowns (option node count and text
+length per dropdown) and, if it matches a catalog entry, selects the cached
+options directly. On a mismatch it enumerates the page and the result is
+learned as a new variant of that stage.
+
+Each variant stores a sha256 of its options, checked on load so a hand-edited
+or truncated catalog is relearned rather than trusted; an unreadable file is
+treated as empty. The catalog version is bumped whenever a variant is learned.
+Saves go through a per-process temp file, so parallel scrapes can learn
+variants at the same time.
+
+Usage:
+    python competency_catalog.py            # show the catalog
+    python competency_catalog.py --clear    # forget everything
+"""
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from profiling import start_from_argv
+
+CATALOG_FILE = 'competency_catalog.json'
+SCHEMA_VERSION = 1
+
+def options_hash(dropdowns):
+    """Content hash of dropdown positions and their option lists."""
+    canonical = json.dumps([[d['index'], d['options']] for d in dropdowns], separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def fingerprint_key(fingerprint):
+    return hashlib.sha256(json.dumps(fingerprint, separators=(',', ':')).encode()).hexdigest()[:16]
+
+class CompetencyCatalog:
+    """Per-stage dropdown options, keyed by page fingerprint."""
+
+    def __init__(self, path=CATALOG_FILE):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.data = self.load()
+
+    def load(self):
+        empty = {'schema': SCHEMA_VERSION, 'version': 0, 'stages': {}}
+        if not os.path.exists(self.path):
+            return empty
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get('schema') != SCHEMA_VERSION:
+                return empty
+
+            for stage_key, variants in data['stages'].items():
+                for key in list(variants):
+                    if options_hash(variants[key]['dropdowns']) != variants[key]['hash']:
+                        print(f"  Catalog entry {stage_key}/{key} failed hash check, will relearn")
+                        del variants[key]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"  Catalog {self.path} unreadable ({e}), starting empty")
+            return empty
+        return data
+
+    def save(self):
+        # Other workers may have learned variants since we loaded
+        if os.path.exists(self.path):
+            on_disk = self.load()
+            for stage_key, variants in on_disk['stages'].items():
+                for key, entry in variants.items():
+                    self.data['stages'].setdefault(stage_key, {}).setdefault(key, entry)
+            self.data['version'] = max(self.data['version'], on_disk['version'])
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp, self.path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def lookup(self, stage_key, fingerprint):
+        """Cached dropdowns for a matching fingerprint, or None."""
+        entry = self.data['stages'].get(stage_key, {}).get(fingerprint_key(fingerprint))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry['dropdowns']
+
+    def learn(self, stage_key, fingerprint, dropdowns, source=''):
+        """Record the enumerated dropdowns for this fingerprint."""
+        dropdowns = [{'index': d['index'], 'options': d['options'], 'type': d['type']} for d in dropdowns]
+        if not dropdowns:
+            return
+        self.data['version'] += 1
+        self.data['stages'].setdefault(stage_key, {})[fingerprint_key(fingerprint)] = {
+            'fingerprint': fingerprint,
+            'dropdowns': dropdowns,
+            'hash': options_hash(dropdowns),
+            'catalog_version': self.data['version'],
+            'learned_from': source,
+            'learned_at': datetime.now().isoformat()
+        }
+        # The variant stays cached in memory even if the write fails
+        try:
+            self.save()
+        except OSError as e:
+            print(f"  Could not save {self.path}: {e}")
+
+def main():
+    args = sys.argv[1:]
+    if args == ['--clear']:
+        if os.path.exists(CATALOG_FILE):
+            os.remove(CATALOG_FILE)
+        print(f"✓ Cleared {CATALOG_FILE}")
+        return
+    if args:
+        print(__doc__.strip().split('Usage:')[1].rstrip())
+        sys.exit(1)
+
+    catalog = CompetencyCatalog()
+    print(f"{CATALOG_FILE}: version {catalog.data['version']}")
+    for stage_key, variants in catalog.data['stages'].items():
+        for key, entry in variants.items():
+            options = sum(len(d['options']) for d in entry['dropdowns'])
+            print(f"  {stage_key} [{key}] v{entry['catalog_version']}: "
+                  f"{len(entry['dropdowns'])} dropdowns, {options} options "
+                  f"(learned from {entry['learned_from'] or '?'})")
+
+if __name__ == "__main__":
+    start_from_argv()
+    main()
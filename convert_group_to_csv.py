@@ -1,58 +1,75 @@
 #!/usr/bin/env python3
 """
 Convert group JSON results to CSV format matching parakh_competency_data.csv
+
+Records scraped from district-level dashboards (scrape_groups.py --districts)
+carry area_code/area. Their points would collide with the state dashboard's
+(State, District, Stage, Competency_Code) keys, so they go to a separate
+group{X}_district_dashboards.csv with Area_Code/Area columns and are never
+combined into the state-level data.
 """
+import glob
 import json
 import pandas as pd
 import sys
 import re
+from concurrent.futures import ProcessPoolExecutor
+from area_frontier import cached_state_codes
+from profiling import start_from_argv
 
 def extract_competency_code(text):
     """Extract competency code from text."""
     match = re.search(r'(C-\d+\.?\d*)', text)
     return match.group(1) if match else text
 
+# Competency to Subject mapping from PARAKH framework
+COMPETENCY_SUBJECTS = {
+    'Foundational Stage': {
+        'C-10.5': 'Language', 'C-10.7': 'Language', 'C-9.7': 'Language',
+        'C-8.1': 'Mathematics', 'C-8.2': 'Mathematics', 'C-8.4': 'Mathematics',
+        'C-8.5': 'Mathematics', 'C-8.6': 'Mathematics', 'C-8.7': 'Mathematics',
+        'C-8.8': 'Mathematics', 'C-8.9': 'Mathematics', 'C-8.10': 'Mathematics',
+        'C-8.11': 'Mathematics', 'C-8.12': 'Mathematics', 'C-8.13': 'Mathematics'
+    },
+    'Preparatory Stage': {
+        'C-2.1': 'Language', 'C-2.2': 'Language',
+        'C-1.1': 'Mathematics', 'C-1.2': 'Mathematics', 'C-1.3': 'Mathematics',
+        'C-1.4': 'Mathematics', 'C-2.4': 'Mathematics', 'C-3.3': 'Mathematics',
+        'C-3.5': 'Mathematics', 'C-4.1': 'Mathematics', 'C-4.3': 'Mathematics',
+        'C-3.1': 'World Around Us', 'C-3.2': 'World Around Us', 'C-4.7': 'World Around Us', 'C-5.3': 'World Around Us'
+    },
+    'Middle Stage': {
+        'C-1.1': 'Language',
+        'C-1.2': 'Mathematics', 'C-2.1': 'Mathematics', 'C-3.1': 'Mathematics',
+        'C-4.1': 'Mathematics', 'C-5.1': 'Mathematics', 'C-6.1': 'Mathematics',
+        'C-2.2': 'Science', 'C-2.3': 'Science', 'C-2.4': 'Science',
+        'C-3.2': 'Science', 'C-4.3': 'Science', 'C-7.3': 'Science',
+        'C-1.4': 'Social Science', 'C-4.2': 'Social Science', 'C-6.2': 'Social Science',
+        'C-6.3': 'Social Science', 'C-6.4': 'Social Science', 'C-7.1': 'Social Science',
+        'C-7.2': 'Social Science', 'C-8.2': 'Social Science', 'C-8.3': 'Social Science', 'C-9.1': 'Social Science'
+    }
+}
+
 def get_subject(stage, comp_code):
     """Map competency code to subject based on stage."""
-    # Competency to Subject mapping from PARAKH framework
-    mapping = {
-        'Foundational Stage': {
-            'C-10.5': 'Language', 'C-10.7': 'Language', 'C-9.7': 'Language',
-            'C-8.1': 'Mathematics', 'C-8.2': 'Mathematics', 'C-8.4': 'Mathematics',
-            'C-8.5': 'Mathematics', 'C-8.6': 'Mathematics', 'C-8.7': 'Mathematics',
-            'C-8.8': 'Mathematics', 'C-8.9': 'Mathematics', 'C-8.10': 'Mathematics',
-            'C-8.11': 'Mathematics', 'C-8.12': 'Mathematics', 'C-8.13': 'Mathematics'
-        },
-        'Preparatory Stage': {
-            'C-2.1': 'Language', 'C-2.2': 'Language',
-            'C-1.1': 'Mathematics', 'C-1.2': 'Mathematics', 'C-1.3': 'Mathematics',
-            'C-1.4': 'Mathematics', 'C-2.4': 'Mathematics', 'C-3.3': 'Mathematics',
-            'C-3.5': 'Mathematics', 'C-4.1': 'Mathematics', 'C-4.3': 'Mathematics',
-            'C-3.1': 'World Around Us', 'C-3.2': 'World Around Us', 'C-4.7': 'World Around Us', 'C-5.3': 'World Around Us'
-        },
-        'Middle Stage': {
-            'C-1.1': 'Language',
-            'C-1.2': 'Mathematics', 'C-2.1': 'Mathematics', 'C-3.1': 'Mathematics',
-            'C-4.1': 'Mathematics', 'C-5.1': 'Mathematics', 'C-6.1': 'Mathematics',
-            'C-2.2': 'Science', 'C-2.3': 'Science', 'C-2.4': 'Science',
-            'C-3.2': 'Science', 'C-4.3': 'Science', 'C-7.3': 'Science',
-            'C-1.4': 'Social Science', 'C-4.2': 'Social Science', 'C-6.2': 'Social Science',
-            'C-6.3': 'Social Science', 'C-6.4': 'Social Science', 'C-7.1': 'Social Science',
-            'C-7.2': 'Social Science', 'C-8.2': 'Social Science', 'C-8.3': 'Social Science', 'C-9.1': 'Social Science'
-        }
-    }
-    return mapping.get(stage, {}).get(comp_code, 'Unknown')
+    return COMPETENCY_SUBJECTS.get(stage, {}).get(comp_code, 'Unknown')
 
-def json_to_csv(json_file, csv_file):
-    """Convert group JSON to CSV."""
-    print(f"Converting {json_file} to {csv_file}...")
-    
-    with open(json_file, 'r') as f:
-        data = json.load(f)
-    
+COLUMNS = ['State', 'State_Code', 'District', 'Stage', 'Subject', 'Competency_Code',
+           'Competency_Description', 'Score_Percent']
+AREA_COLUMNS = ['Area_Code', 'Area']
+
+def records_to_frame(data, district_dashboards=False):
+    """Convert scraped group records to a sorted DataFrame in the CSV format.
+
+    Only state-dashboard records are included, or with `district_dashboards`
+    only the records from district-level dashboards, with Area_Code/Area.
+    """
     rows = []
     for record in data:
+        if bool(record.get('area_code')) != district_dashboards:
+            continue
         state = record.get('state', '')
+        state_code = record.get('state_code', '')
         stage = record.get('stage', '')
         comp_code = extract_competency_code(record.get('competency_code', ''))
         chart_title = record.get('chart_title', '')
@@ -68,27 +85,34 @@ def json_to_csv(json_file, csv_file):
             score = point.get('y')
             
             if district and score is not None:
-                rows.append({
+                row = {
                     'State': state,
-                    'State_Code': '',
+                    'State_Code': state_code,
                     'District': district,
                     'Stage': stage,
                     'Subject': subject,
                     'Competency_Code': comp_code,
                     'Competency_Description': chart_title,
                     'Score_Percent': round(score, 2)
-                })
+                }
+                if district_dashboards:
+                    row['Area_Code'] = record['area_code']
+                    row['Area'] = record.get('area', '')
+                rows.append(row)
     
-    df = pd.DataFrame(rows)
+    df = pd.DataFrame(rows, columns=COLUMNS + (AREA_COLUMNS if district_dashboards else []))
     
-    # Add state codes
+    # Records from older scrapes have no state_code: look it up by name in the
+    # getArea cache, falling back to the codes known when this was written
     state_codes = {
+        'Jammu & Kashmir': 'IND01',
         'Himachal Pradesh': 'IND02',
         'Punjab': 'IND03',
         'Chandigarh': 'IND04',
         'Uttarakhand': 'IND05',
         'Haryana': 'IND06',
         'NCT of Delhi': 'IND07',
+        'Rajasthan': 'IND08',
         'Uttar Pradesh': 'IND09',
         'Bihar': 'IND10',
         'Sikkim': 'IND11',
@@ -100,13 +124,17 @@ def json_to_csv(json_file, csv_file):
         'Meghalaya': 'IND17',
         'Assam': 'IND18',
         'West Bengal': 'IND19',
+        'Jharkhand': 'IND20',
         'Odisha': 'IND21',
+        'Chhattisgarh': 'IND22',
         'Madhya Pradesh': 'IND23',
         'Gujarat': 'IND24',
         'Maharashtra': 'IND27',
+        'Andhra Pradesh': 'IND28',
         'Karnataka': 'IND29',
         'Goa': 'IND30',
         'Lakshadweep': 'IND31',
+        'Kerala': 'IND32',
         'Tamil Nadu': 'IND33',
         'Puducherry': 'IND34',
         'Andaman & Nicobar Islands': 'IND35',
@@ -115,7 +143,9 @@ def json_to_csv(json_file, csv_file):
         'Daman & Diu and Dadra & Nagar Haveli': 'IND38'
     }
     
-    df['State_Code'] = df['State'].map(state_codes)
+    state_codes.update(cached_state_codes())
+    missing = df['State_Code'].isin(['', None]) | df['State_Code'].isna()
+    df.loc[missing, 'State_Code'] = df.loc[missing, 'State'].map(state_codes)
     
     # Sort by State, District, Stage, then Competency
     stage_order = {'Foundational Stage': 1, 'Preparatory Stage': 2, 'Middle Stage': 3}
@@ -123,9 +153,58 @@ def json_to_csv(json_file, csv_file):
     
     df = df.sort_values(['State', 'District', '_stage_order', 'Competency_Code'])
     df = df.drop('_stage_order', axis=1)
+    return df
+
+def load_group_frame(json_file):
+    """Load one group JSON file as a DataFrame (process pool worker)."""
+    with open(json_file, 'r') as f:
+        data = json.load(f)
+    return json_file, records_to_frame(data)
+
+def load_group_frames(json_file):
+    """Load one group JSON file as state-dashboard and district-dashboard frames."""
+    with open(json_file, 'r') as f:
+        data = json.load(f)
+    return json_file, records_to_frame(data), records_to_frame(data, district_dashboards=True)
+
+def save_district_dashboards(json_file, df):
+    """Write district-dashboard rows, if any, next to the group CSV."""
+    if df.empty:
+        return
+    csv_file = json_file.replace('_results.json', '_district_dashboards.csv')
+    df.to_csv(csv_file, index=False)
+    print(f"✓ Saved {len(df)} district-dashboard rows to {csv_file}")
+
+def convert_all(pattern='group*_results.json', workers=None):
+    """Convert all group JSON files concurrently. Returns {json_file: DataFrame}."""
+    json_files = sorted(glob.glob(pattern))
+    if not json_files:
+        return {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(load_group_frame, json_files))
+
+def convert_all_to_csv(pattern='group*_results.json'):
+    """Convert all group JSON files concurrently and save each as group{X}_data.csv."""
+    json_files = sorted(glob.glob(pattern))
+    if not json_files:
+        return
+    with ProcessPoolExecutor() as pool:
+        frames = list(pool.map(load_group_frames, json_files))
+    for json_file, df, district_df in frames:
+        csv_file = json_file.replace('_results.json', '_data.csv')
+        df.to_csv(csv_file, index=False)
+        print(f"✓ Saved {len(df)} rows to {csv_file}")
+        save_district_dashboards(json_file, district_df)
+
+def json_to_csv(json_file, csv_file):
+    """Convert group JSON to CSV."""
+    print(f"Converting {json_file} to {csv_file}...")
+    
+    _, df, district_df = load_group_frames(json_file)
     
     # Save
     df.to_csv(csv_file, index=False)
+    save_district_dashboards(json_file, district_df)
     
     print(f"✓ Saved {len(df)} rows to {csv_file}")
     print(f"  States: {df['State'].nunique()}")
@@ -133,11 +212,16 @@ def json_to_csv(json_file, csv_file):
     print(f"  Competencies: {df['Competency_Code'].nunique()}")
 
 if __name__ == "__main__":
+    start_from_argv()
     if len(sys.argv) != 2:
-        print("Usage: python convert_group_to_csv.py <group_number>")
+        print("Usage: python convert_group_to_csv.py <group_number|all>")
         sys.exit(1)
     
     group_num = sys.argv[1]
+    if group_num == 'all':
+        convert_all_to_csv()
+        sys.exit(0)
+    
     json_file = f'group{group_num}_results.json'
     csv_file = f'group{group_num}_data.csv'
     
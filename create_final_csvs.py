@@ -11,6 +11,8 @@ Columns: State, District, Subject, LO_Code, Description, Score
 import json
 import pandas as pd
 import re
+from district_registry import DistrictRegistry
+from profiling import start_from_argv
 
 # Subject mapping from series codes
 SUBJECT_FROM_SERIES = {
@@ -63,7 +65,7 @@ def extract_name(name_field):
     return str(name_field).strip() if name_field else ''
 
 def load_data():
-    with open('/Users/avra/paragh/all_results.json', 'r') as f:
+    with open('all_results.json', 'r') as f:
         return json.load(f)
 
 def infer_subject_from_description(description):
@@ -196,12 +198,16 @@ def process_stage(data, stage_name):
     
     return pd.DataFrame(rows)
 
-def validate_and_save(df, filename, stage_name):
+def validate_and_save(df, filename, stage_name, registry=None):
     """Validate dataframe and save to CSV."""
     if df.empty:
         print(f"WARNING: No data for {stage_name}")
         return
     
+    # Canonicalize district spellings before de-duplicating
+    if registry is not None:
+        df = registry.canonicalize_frame(df)
+    
     # Remove duplicates
     df = df.drop_duplicates(subset=['State', 'District', 'Subject', 'LO_Code'])
     
@@ -231,7 +237,7 @@ def validate_and_save(df, filename, stage_name):
         print(f"  ✓ All entries complete")
     
     # Save
-    df.to_csv(f'/Users/avra/paragh/{filename}', index=False)
+    df.to_csv(filename, index=False)
     print(f"  Saved to {filename}")
 
 def main():
@@ -246,12 +252,15 @@ def main():
     middle_df = process_stage(data, 'Middle Stage')
     
     # Validate and save
-    validate_and_save(foundational_df, 'foundational_stage.csv', 'Foundational Stage (Grade 3)')
-    validate_and_save(preparatory_df, 'preparatory_stage.csv', 'Preparatory Stage (Grade 6)')
-    validate_and_save(middle_df, 'middle_stage.csv', 'Middle Stage (Grade 9)')
+    registry = DistrictRegistry.load()
+    validate_and_save(foundational_df, 'foundational_stage.csv', 'Foundational Stage (Grade 3)', registry)
+    validate_and_save(preparatory_df, 'preparatory_stage.csv', 'Preparatory Stage (Grade 6)', registry)
+    validate_and_save(middle_df, 'middle_stage.csv', 'Middle Stage (Grade 9)', registry)
+    registry.save()
     
     print("\n" + "=" * 60)
     print("Done!")
 
 if __name__ == "__main__":
+    start_from_argv()
     main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Canonical district names per state.
+
+District names come straight from Highcharts point names, so the same district
+can show up as "Y.S.R. Kadapa", "YSR Kadapa" or "Ysr  Kadapa" across stages and
+runs. The registry maps each spelling to one canonical name:
+
+1. Exact lookup on a normalized key (case, punctuation, spacing, accents,
+   '&'/'and' and a trailing "district" are ignored).
+2. For unseen keys, an approximate match through a per-state trigram index:
+   only names sharing trigrams with the query are scored, so a lookup never
+   compares against every district. Names that differ in a direction word or
+   number (North/South Goa, 24 Parganas) are never merged.
+
+Frames are canonicalized per unique (State, District) pair and mapped back, so
+the cost is linear in the number of rows. Learned aliases persist in
+district_registry.json; saves merge with what is on disk and replace the file
+atomically, so concurrent pipeline steps neither read a partial file nor drop
+each other's aliases.
+"""
+import json
+import os
+import re
+import sys
+import unicodedata
+from collections import Counter, defaultdict
+from profiling import start_from_argv
+
+REGISTRY_FILE = 'district_registry.json'
+
+# Minimum trigram Jaccard similarity for an approximate match
+MATCH_THRESHOLD = 0.6
+
+# Tokens that distinguish otherwise similar district names
+MARKER_WORDS = {'north', 'south', 'east', 'west', 'central', 'upper', 'lower',
+                'new', 'old', 'rural', 'urban'}
+
+def normalize_key(name):
+    """Normalized lookup key for a district name."""
+    if isinstance(name, dict):
+        name = name.get('name', '') or name.get('userOptions', '')
+    if not isinstance(name, str):
+        return ''
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c)).lower()
+    name = name.replace('&', ' and ')
+    name = re.sub(r'[^a-z0-9]+', ' ', name)
+    name = re.sub(r'\s+district$', '', name.strip())
+    return re.sub(r'\s+', '', name)
+
+def markers(name):
+    """Direction words and numbers in a district name."""
+    if isinstance(name, dict):
+        name = name.get('name', '') or name.get('userOptions', '')
+    tokens = re.findall(r'[a-z]+|\d+', str(name).lower())
+    return frozenset(t for t in tokens if t in MARKER_WORDS or t.isdigit())
+
+def trigrams(key):
+    """Character trigrams of a key, padded so short names still match."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class DistrictRegistry:
+    """Per-state canonical names with a normalized-key and trigram index."""
+
+    def __init__(self, threshold=MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.canonical = defaultdict(dict)   # state -> key -> canonical name
+        self.markers = {}                    # (state, key) -> marker tokens
+        self.aliases = defaultdict(dict)     # state -> key -> canonical key
+        self.grams = defaultdict(lambda: defaultdict(set))  # state -> trigram -> keys
+
+    def add(self, state, name):
+        """Register `name` as the canonical spelling for its key in `state`."""
+        key = normalize_key(name)
+        if not key or key in self.canonical[state]:
+            return
+        self.canonical[state][key] = name.strip()
+        self.markers[(state, key)] = markers(name)
+        for gram in trigrams(key):
+            self.grams[state][gram].add(key)
+
+    def _approximate(self, state, key, name_markers):
+        """Best canonical key sharing enough trigrams with `key`, or None."""
+        query = trigrams(key)
+        shared = Counter()
+        index = self.grams[state]
+        for gram in query:
+            for candidate in index.get(gram, ()):
+                shared[candidate] += 1
+
+        best, best_score = None, 0.0
+        for candidate, overlap in shared.items():
+            if self.markers[(state, candidate)] != name_markers:
+                continue
+            score = overlap / (len(query) + len(trigrams(candidate)) - overlap)
+            if score > best_score:
+                best, best_score = candidate, score
+        return best if best_score >= self.threshold else None
+
+    def resolve(self, state, name):
+        """Canonical name for a district spelling; new names become canonical."""
+        key = normalize_key(name)
+        if not key:
+            return name
+        names = self.canonical[state]
+        if key in names:
+            return names[key]
+        if key in self.aliases[state]:
+            return names[self.aliases[state][key]]
+
+        match = self._approximate(state, key, markers(name))
+        if match:
+            self.aliases[state][key] = match
+            return names[match]
+
+        raw = name.get('name', '') if isinstance(name, dict) else name
+        self.add(state, raw)
+        return names.get(key, raw)
+
+    def canonicalize_frame(self, df, state_col='State', district_col='District'):
+        """Replace district names in `df` with canonical ones (in place).
+
+        Missing or non-string district names are left unchanged.
+        """
+        # Resolve unique pairs, most frequent spelling first so it becomes canonical
+        counts = df.groupby([state_col, district_col], dropna=False).size().sort_values(ascending=False)
+        mapping = {(s, d): self.resolve(s, d) for s, d in counts.index if isinstance(d, str)}
+        keys = zip(df[state_col], df[district_col])
+        df[district_col] = [mapping.get((s, d), d) if isinstance(d, str) else d for s, d in keys]
+
+        renamed = sum(1 for (s, d), c in mapping.items() if d != c)
+        if renamed:
+            print(f"  Canonicalized {renamed} district spelling(s)")
+        return df
+
+    @classmethod
+    def load(cls, filename=REGISTRY_FILE):
+        registry = cls()
+        if os.path.exists(filename):
+            with open(filename, 'r') as f:
+                data = json.load(f)
+            for state, entry in data.items():
+                for name in entry.get('districts', []):
+                    registry.add(state, name)
+                registry.aliases[state].update(entry.get('aliases', {}))
+        return registry
+
+    def save(self, filename=REGISTRY_FILE):
+        # Other processes may have learned names since we loaded
+        on_disk = self.load(filename)
+        for state, names in on_disk.canonical.items():
+            for name in names.values():
+                self.add(state, name)
+            for key, target in on_disk.aliases[state].items():
+                self.aliases[state].setdefault(key, target)
+
+        data = {
+            state: {
+                'districts': sorted(names.values()),
+                'aliases': dict(sorted(self.aliases[state].items()))
+            }
+            for state, names in sorted(self.canonical.items())
+        }
+        tmp = f"{filename}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, filename)
+
+if __name__ == "__main__":
+    start_from_argv()
+    if len(sys.argv) != 3:
+        print("Usage: python district_registry.py <state> <district_name>")
+        sys.exit(1)
+    registry = DistrictRegistry.load()
+    print(registry.resolve(sys.argv[1], sys.argv[2]))
@@ -4,6 +4,7 @@ Explore the PARAKH dashboard to understand the structure and find competencies.
 import asyncio
 from playwright.async_api import async_playwright
 import json
+from profiling import start_from_argv
 
 async def explore_dashboard():
     async with async_playwright() as p:
@@ -86,4 +87,5 @@ async def explore_dashboard():
         await browser.close()
 
 if __name__ == "__main__":
+    start_from_argv()
     asyncio.run(explore_dashboard())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Find gaps in parakh_competency_data_all.csv and re-scrape only those units.
+
+The expected catalog is every known state x stage x competency (from
+COMPETENCY_SUBJECTS), with the districts already seen for each state/stage.
+Known states are the areas discovered through getArea (cached in
+area_data.json), on top of the built-in state lists.
+A unit is re-scraped when:
+- the whole state/stage slice is missing (all options are selected), or
+- a competency is missing, or has fewer districts than the rest of its
+  state/stage (only those dropdown options are selected)
+
+Results go to groupgaps_results.json, so the normal flow picks them up:
+    python convert_group_to_csv.py gaps
+    python combine_all_csvs.py
+
+Usage:
+    python fill_gaps.py [--plan]
+"""
+import asyncio
+import json
+import sys
+
+import pandas as pd
+from playwright.async_api import async_playwright
+
+from convert_group_to_csv import COMPETENCY_SUBJECTS
+from scrape_groups import STATE_GROUPS, STAGES, discover_states, scrape_state_stage
+from scrape_parakh import STATES as ORIGINAL_STATES
+from competency_catalog import CompetencyCatalog
+from profiling import start_from_argv
+
+INPUT_FILE = 'parakh_competency_data_all.csv'
+PLAN_FILE = 'gaps_plan.json'
+OUTPUT_FILE = 'groupgaps_results.json'
+
+async def known_states():
+    """All state codes -> names: discovered areas over the built-in lists."""
+    states = dict(ORIGINAL_STATES)
+    for group in STATE_GROUPS.values():
+        states.update(group)
+    try:
+        states.update((await discover_states())[0])
+    except Exception as e:
+        print(f"  Area discovery failed ({e}), using the built-in state lists")
+    return states
+
+def find_gaps(df, states):
+    """Build the minimal work list of (state, stage, competencies) to re-scrape."""
+    stage_keys = {name: key for key, name in STAGES.items()}
+
+    catalog = pd.DataFrame(
+        [(code, name, stage, comp)
+         for code, name in states.items()
+         for stage, comps in COMPETENCY_SUBJECTS.items()
+         for comp in comps],
+        columns=['State_Code', 'State', 'Stage', 'Competency_Code'])
+
+    counts = (df.groupby(['State', 'Stage', 'Competency_Code'])['District']
+              .nunique().rename('Districts').reset_index())
+    # Districts expected for a state/stage = most seen under any of its competencies
+    counts['Expected'] = counts.groupby(['State', 'Stage'])['Districts'].transform('max')
+
+    cells = catalog.merge(counts, on=['State', 'Stage', 'Competency_Code'], how='left')
+    cells['Stage_Present'] = cells.groupby(['State', 'Stage'])['Districts'].transform('count') > 0
+    cells = cells[cells['Districts'].isna() | (cells['Districts'] < cells['Expected'])]
+
+    units = []
+    for (code, state, stage), group in cells.groupby(['State_Code', 'State', 'Stage'], sort=True):
+        whole_stage = not group['Stage_Present'].iloc[0]
+        units.append({
+            'state_code': code,
+            'state': state,
+            'stage_key': stage_keys[stage],
+            'stage': stage,
+            'competencies': None if whole_stage else sorted(group['Competency_Code']),
+            'reason': 'missing stage' if whole_stage else 'missing/incomplete competencies'
+        })
+    return units
+
+async def scrape_units(units):
+    """Re-scrape just the given units."""
+    all_results = []
+    catalog = CompetencyCatalog()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        page.set_default_timeout(90000)
+
+        for unit in units:
+            only = set(unit['competencies']) if unit['competencies'] else None
+            results = await scrape_state_stage(page, unit['state_code'], unit['state'],
+                                               unit['stage_key'], unit['stage'], only_codes=only,
+                                               catalog=catalog)
+            all_results.extend(results)
+            await asyncio.sleep(2)
+
+        await browser.close()
+
+    return all_results
+
+async def main():
+    args = sys.argv[1:]
+    if args and args != ['--plan']:
+        print("Usage: python fill_gaps.py [--plan]")
+        sys.exit(1)
+
+    df = pd.read_csv(INPUT_FILE)
+    units = find_gaps(df, await known_states())
+
+    with open(PLAN_FILE, 'w') as f:
+        json.dump(units, f, indent=2)
+
+    options = sum(len(u['competencies'] or COMPETENCY_SUBJECTS[u['stage']]) for u in units)
+    print(f"Found {len(units)} state/stage units with gaps ({options} competency options)")
+    for unit in units:
+        comps = ', '.join(unit['competencies']) if unit['competencies'] else 'all'
+        print(f"  {unit['state']} - {unit['stage']}: {comps}")
+    print(f"Plan saved to {PLAN_FILE}")
+
+    if '--plan' in args or not units:
+        return
+
+    results = await scrape_units(units)
+    if results:
+        with open(OUTPUT_FILE, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ Saved {len(results)} records to {OUTPUT_FILE}")
+        print("  Next: python convert_group_to_csv.py gaps && python combine_all_csvs.py")
+    else:
+        print("\n✗ No data recovered")
+
+if __name__ == "__main__":
+    start_from_argv()
+    asyncio.run(main())
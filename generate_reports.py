@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Generate the report charts from parakh_competency_data_all.csv:
+1. state_coverage_and_distribution.png - districts per state + score distribution per stage
+2. state_subject_heatmap.png           - mean score per state x subject
+3. state_performance_comparison.png    - mean score per state, ranked
+4. stage_performance_chart.png         - mean score per stage x subject
+
+Each chart is drawn from a small pre-aggregated slice, never from raw rows.
+Each chart's cache key hashes its slice together with the source of its
+plot function and RENDER_VERSION, and charts whose key is unchanged since the
+last run are skipped (cache in .report_cache.json). The rest render in parallel
+worker processes on the Agg backend.
+"""
+import hashlib
+import inspect
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from profiling import start_from_argv
+
+INPUT_FILE = 'parakh_competency_data_all.csv'
+CACHE_FILE = '.report_cache.json'
+# Bump when shared rendering code (render(), dpi, backend) changes
+RENDER_VERSION = 1
+
+STAGE_ORDER = ['Foundational Stage', 'Preparatory Stage', 'Middle Stage']
+SUBJECT_ORDER = ['Language', 'Mathematics', 'World Around Us', 'Science', 'Social Science']
+
+def load_data(filename=INPUT_FILE):
+    """Load only the columns the charts need."""
+    df = pd.read_csv(filename, usecols=['State', 'District', 'Stage', 'Subject', 'Score_Percent'])
+    for col in ['State', 'Stage', 'Subject']:
+        df[col] = df[col].astype('category')
+    return df
+
+def aggregate(df):
+    """Build the per-chart input slices."""
+    coverage = (df.groupby('State', observed=True)
+                .agg(Districts=('District', 'nunique'), Rows=('Score_Percent', 'count'))
+                .sort_values('Districts', ascending=False))
+
+    bins = list(range(0, 105, 5))
+    distribution = pd.DataFrame({
+        stage: pd.cut(df.loc[df['Stage'] == stage, 'Score_Percent'], bins=bins, include_lowest=True)
+               .value_counts(sort=False).values
+        for stage in STAGE_ORDER
+    }, index=bins[:-1])
+
+    heatmap = df.pivot_table(index='State', columns='Subject', values='Score_Percent',
+                             aggfunc='mean', observed=True).round(1)
+    heatmap = heatmap[[s for s in SUBJECT_ORDER if s in heatmap.columns]]
+
+    comparison = (df.groupby('State', observed=True)['Score_Percent']
+                  .agg(['mean', 'std']).round(2).sort_values('mean'))
+
+    stage_perf = df.pivot_table(index='Stage', columns='Subject', values='Score_Percent',
+                                aggfunc='mean', observed=True).round(2)
+    stage_perf = stage_perf.reindex([s for s in STAGE_ORDER if s in stage_perf.index])
+
+    return {
+        'state_coverage_and_distribution.png': {'coverage': coverage, 'distribution': distribution},
+        'state_subject_heatmap.png': {'heatmap': heatmap},
+        'state_performance_comparison.png': {'comparison': comparison},
+        'stage_performance_chart.png': {'stage_perf': stage_perf}
+    }
+
+def slice_hash(frames, renderer=''):
+    """Content hash of a chart's input slice and the code that draws it."""
+    h = hashlib.sha256()
+    h.update(f"{RENDER_VERSION}\n{renderer}".encode())
+    for name in sorted(frames):
+        frame = frames[name]
+        h.update(name.encode())
+        h.update(frame.to_csv().encode())
+    return h.hexdigest()
+
+def load_cache():
+    if os.path.exists(CACHE_FILE):
+        with open(CACHE_FILE, 'r') as f:
+            return json.load(f)
+    return {}
+
+def save_cache(cache):
+    with open(CACHE_FILE, 'w') as f:
+        json.dump(cache, f, indent=2)
+
+def plot_coverage(frames, filename):
+    import matplotlib.pyplot as plt
+    coverage, distribution = frames['coverage'], frames['distribution']
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 8))
+    ax1.barh(coverage.index.astype(str), coverage['Districts'], color='steelblue')
+    ax1.invert_yaxis()
+    ax1.set_title('Districts covered per State/UT')
+    ax1.set_xlabel('Districts')
+    for stage in distribution.columns:
+        ax2.plot(distribution.index + 2.5, distribution[stage], marker='o', label=stage)
+    ax2.set_title('Score distribution by stage')
+    ax2.set_xlabel('Score (%)')
+    ax2.set_ylabel('Rows')
+    ax2.legend()
+    fig.tight_layout()
+    fig.savefig(filename, dpi=120)
+    plt.close(fig)
+
+def plot_heatmap(frames, filename):
+    import matplotlib.pyplot as plt
+    heatmap = frames['heatmap']
+    fig, ax = plt.subplots(figsize=(10, max(6, len(heatmap) * 0.35)))
+    im = ax.imshow(heatmap.values, cmap='RdYlGn', vmin=0, vmax=100, aspect='auto')
+    ax.set_xticks(range(len(heatmap.columns)))
+    ax.set_xticklabels(heatmap.columns, rotation=30, ha='right')
+    ax.set_yticks(range(len(heatmap.index)))
+    ax.set_yticklabels(heatmap.index.astype(str))
+    for i in range(heatmap.shape[0]):
+        for j in range(heatmap.shape[1]):
+            value = heatmap.iat[i, j]
+            if pd.notna(value):
+                ax.text(j, i, f"{value:.0f}", ha='center', va='center', fontsize=7)
+    fig.colorbar(im, ax=ax, label='Mean score (%)')
+    ax.set_title('Mean score by State and Subject')
+    fig.tight_layout()
+    fig.savefig(filename, dpi=120)
+    plt.close(fig)
+
+def plot_comparison(frames, filename):
+    import matplotlib.pyplot as plt
+    comparison = frames['comparison']
+    fig, ax = plt.subplots(figsize=(10, max(6, len(comparison) * 0.3)))
+    ax.barh(comparison.index.astype(str), comparison['mean'], xerr=comparison['std'],
+            color='darkorange', ecolor='gray', capsize=2)
+    ax.axvline(comparison['mean'].mean(), color='black', linestyle='--', label='Average of states')
+    ax.set_xlabel('Mean score (%)')
+    ax.set_title('State performance comparison')
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(filename, dpi=120)
+    plt.close(fig)
+
+def plot_stage_performance(frames, filename):
+    import matplotlib.pyplot as plt
+    stage_perf = frames['stage_perf']
+    fig, ax = plt.subplots(figsize=(10, 6))
+    stage_perf.plot(kind='bar', ax=ax, rot=0)
+    ax.set_ylabel('Mean score (%)')
+    ax.set_ylim(0, 100)
+    ax.set_title('Performance by stage and subject')
+    fig.tight_layout()
+    fig.savefig(filename, dpi=120)
+    plt.close(fig)
+
+PLOTTERS = {
+    'state_coverage_and_distribution.png': plot_coverage,
+    'state_subject_heatmap.png': plot_heatmap,
+    'state_performance_comparison.png': plot_comparison,
+    'stage_performance_chart.png': plot_stage_performance
+}
+
+def render(filename, frames):
+    """Worker entry point: render one chart on the Agg backend."""
+    import matplotlib
+    matplotlib.use('Agg')
+    PLOTTERS[filename](frames, filename)
+    return filename
+
+def generate_reports(input_file=INPUT_FILE, force=False, workers=None):
+    """Render all charts whose input slice changed. Returns the rendered filenames."""
+    print("Generating report charts...")
+    print("=" * 60)
+
+    slices = aggregate(load_data(input_file))
+    cache = {} if force else load_cache()
+
+    todo = {}
+    for filename, frames in slices.items():
+        digest = slice_hash(frames, inspect.getsource(PLOTTERS[filename]))
+        if cache.get(filename) == digest and os.path.exists(filename):
+            print(f"  - {filename} unchanged, skipped")
+            continue
+        todo[filename] = (frames, digest)
+
+    rendered = []
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers or min(len(todo), os.cpu_count() or 1)) as pool:
+            futures = {pool.submit(render, filename, frames): filename
+                       for filename, (frames, _) in todo.items()}
+            for future, filename in futures.items():
+                future.result()
+                cache[filename] = todo[filename][1]
+                rendered.append(filename)
+                print(f"  ✓ {filename}")
+        save_cache(cache)
+
+    print("=" * 60)
+    print(f"Rendered {len(rendered)}, skipped {len(slices) - len(rendered)}")
+    return rendered
+
+if __name__ == "__main__":
+    start_from_argv()
+    args = sys.argv[1:]
+    force = '--force' in args
+    args = [a for a in args if a != '--force']
+    if len(args) > 1:
+        print("Usage: python generate_reports.py [input_csv] [--force]")
+        sys.exit(1)
+    generate_reports(args[0] if args else INPUT_FILE, force=force)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Load test for query_service.py: p50/p99 latency and throughput.
+
+Each worker keeps one keep-alive connection and cycles through QUERIES.
+
+Usage:
+    python load_test.py [--requests 2000] [--concurrency 20] [--port 8765]
+"""
+import asyncio
+import sys
+import time
+from profiling import start_from_argv
+
+QUERIES = [
+    '/scores?state=Kerala&limit=100',
+    '/scores?stage=Middle+Stage&subject=Science&limit=100',
+    '/scores?competency=C-8.1',
+    '/aggregate?by=State&agg=mean',
+    '/aggregate?by=State,Subject&stage=Foundational+Stage',
+    '/aggregate?by=Stage,Subject&agg=median',
+    '/aggregate?by=District&state=Rajasthan',
+]
+
+async def fetch(reader, writer, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        if line.lower().startswith(b'content-length:'):
+            length = int(line.split(b':')[1])
+    await reader.readexactly(length)
+    return status
+
+async def worker(port, count, offset, latencies, errors):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for i in range(count):
+        path = QUERIES[(offset + i) % len(QUERIES)]
+        start = time.perf_counter()
+        status = await fetch(reader, writer, path)
+        latencies.append(time.perf_counter() - start)
+        if status != 200:
+            errors.append((path, status))
+    writer.close()
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+async def main():
+    args = sys.argv[1:]
+    opts = {'--requests': 2000, '--concurrency': 20, '--port': 8765}
+    for flag in opts:
+        if flag in args:
+            opts[flag] = int(args[args.index(flag) + 1])
+    total, concurrency, port = opts['--requests'], opts['--concurrency'], opts['--port']
+
+    latencies, errors = [], []
+    per_worker = max(1, total // concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(port, per_worker, i, latencies, errors)
+                           for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    print(f"Requests: {len(latencies):,} in {elapsed:.2f}s ({len(latencies) / elapsed:,.0f} req/s)")
+    print(f"  p50: {percentile(latencies, 50) * 1000:.2f} ms")
+    print(f"  p99: {percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"  max: {max(latencies) * 1000:.2f} ms")
+    if errors:
+        print(f"  ✗ {len(errors)} non-200 responses, e.g. {errors[0]}")
+
+if __name__ == "__main__":
+    start_from_argv()
+    asyncio.run(main())
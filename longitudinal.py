@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Cross-stage comparisons (Grade 3 vs 6 vs 9) from the 3 stage CSVs.
+
+Builds a (district, stage, subject) matrix of mean scores once and caches it
+in longitudinal_matrix.npz, keyed by a content hash of the stage CSVs, so it
+is only rebuilt when they change. Subject names are reconciled across stages
+through SUBJECT_ALIASES; Language and Mathematics are the subjects tested at
+every stage (common_subjects()).
+
+Gap and trend queries are NumPy operations over every district at once:
+
+    m = LongitudinalMatrix.load_or_build()
+    m.gap('Foundational Stage', 'Middle Stage', 'Mathematics')
+    m.trend('Language')
+
+Usage:
+    python longitudinal.py build
+    python longitudinal.py gap <from_stage> <to_stage> [subject]
+    python longitudinal.py trend [subject]
+"""
+import hashlib
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from build_rankings import STAGE_FILES, load_stages
+from profiling import start_from_argv
+
+MATRIX_FILE = 'longitudinal_matrix.npz'
+
+STAGE_GRADES = {
+    'Foundational Stage': 3,
+    'Preparatory Stage': 6,
+    'Middle Stage': 9
+}
+
+SUBJECT_ALIASES = {
+    'language': 'Language',
+    'english': 'Language',
+    'mathematics': 'Mathematics',
+    'maths': 'Mathematics',
+    'math': 'Mathematics',
+    'world around us': 'World Around Us',
+    'evs': 'World Around Us',
+    'science': 'Science',
+    'social science': 'Social Science',
+    'social studies': 'Social Science'
+}
+
+def canonical_subject(subject):
+    key = ' '.join(str(subject).split()).lower()
+    return SUBJECT_ALIASES.get(key, ' '.join(str(subject).split()))
+
+def source_hash(stage_files=STAGE_FILES):
+    """Content hash of the stage CSVs the matrix is built from."""
+    digest = hashlib.sha256()
+    for stage, filename in stage_files.items():
+        digest.update(stage.encode())
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+class LongitudinalMatrix:
+    """Mean score and competency count per (district, stage, subject)."""
+
+    def __init__(self, scores, counts, districts, stages, subjects, source=''):
+        self.scores = scores
+        self.counts = counts
+        self.districts = districts
+        self.stages = list(stages)
+        self.subjects = list(subjects)
+        self.source = source
+        self.stage_index = {s: i for i, s in enumerate(self.stages)}
+        self.subject_index = {s: i for i, s in enumerate(self.subjects)}
+
+    @classmethod
+    def build(cls, df, source=''):
+        """Aggregate a long frame (Stage, State, District, Subject, Score)."""
+        df = df.dropna(subset=['State', 'District', 'Subject', 'Score'])
+        df = df.assign(Subject=df['Subject'].map(canonical_subject))
+
+        means = (df.groupby(['State', 'District', 'Stage', 'Subject'], observed=True)['Score']
+                 .agg(['mean', 'count'])
+                 .reset_index())
+        district_codes, district_keys = pd.factorize(means['State'] + '\x1f' + means['District'], sort=True)
+        stages = [s for s in STAGE_GRADES if s in set(means['Stage'])]
+        stage_codes = pd.Categorical(means['Stage'], categories=stages).codes
+        subject_codes, subjects = pd.factorize(means['Subject'], sort=True)
+
+        shape = (len(district_keys), len(stages), len(subjects))
+        scores = np.full(shape, np.nan, dtype=np.float32)
+        counts = np.zeros(shape, dtype=np.int32)
+        scores[district_codes, stage_codes, subject_codes] = means['mean'].to_numpy(dtype=np.float32)
+        counts[district_codes, stage_codes, subject_codes] = means['count'].to_numpy(dtype=np.int32)
+
+        districts = np.array([key.split('\x1f') for key in district_keys], dtype=str).reshape(-1, 2)
+        return cls(scores, counts, districts, stages, list(subjects), source)
+
+    def save(self, filename=MATRIX_FILE):
+        np.savez(filename, scores=self.scores, counts=self.counts, districts=self.districts,
+                 stages=np.array(self.stages), subjects=np.array(self.subjects),
+                 source=np.array(self.source))
+
+    @classmethod
+    def load(cls, filename=MATRIX_FILE):
+        with np.load(filename) as z:
+            return cls(z['scores'], z['counts'], z['districts'], z['stages'].tolist(),
+                       z['subjects'].tolist(), str(z['source']))
+
+    @classmethod
+    def load_or_build(cls, stage_files=STAGE_FILES, filename=MATRIX_FILE):
+        """Cached matrix if the stage CSVs are unchanged, else rebuild and cache."""
+        source = source_hash(stage_files)
+        if os.path.exists(filename):
+            matrix = cls.load(filename)
+            if matrix.source == source:
+                return matrix
+        matrix = cls.build(load_stages(stage_files), source)
+        matrix.save(filename)
+        return matrix
+
+    def common_subjects(self):
+        """Subjects with data at every stage."""
+        present = (self.counts > 0).any(axis=0).all(axis=0)
+        return [s for s, ok in zip(self.subjects, present) if ok]
+
+    def frame(self, values, columns):
+        """Label a (district, k) array with State/District columns."""
+        out = pd.DataFrame(np.asarray(values).reshape(len(self.districts), -1), columns=columns)
+        out.insert(0, 'District', self.districts[:, 1])
+        out.insert(0, 'State', self.districts[:, 0])
+        return out
+
+    def gap(self, from_stage, to_stage, subject=None):
+        """to_stage minus from_stage score per district and subject.
+
+        With no subject, one Gap column per subject tested at both stages.
+        """
+        a = self.scores[:, self.stage_index[from_stage]]
+        b = self.scores[:, self.stage_index[to_stage]]
+        if subject is not None:
+            j = self.subject_index[canonical_subject(subject)]
+            out = self.frame(np.stack([a[:, j], b[:, j], b[:, j] - a[:, j]], axis=1),
+                             [from_stage, to_stage, 'Gap'])
+            return out.dropna(subset=['Gap']).sort_values('Gap').reset_index(drop=True)
+
+        both = ~np.isnan(a).all(axis=0) & ~np.isnan(b).all(axis=0)
+        subjects = [s for s, ok in zip(self.subjects, both) if ok]
+        out = self.frame((b - a)[:, both], subjects)
+        return out.dropna(subset=subjects, how='all').reset_index(drop=True)
+
+    def trend(self, subject):
+        """Per-district scores at each grade, least-squares slope per grade, and direction."""
+        y = self.scores[:, :, self.subject_index[canonical_subject(subject)]].astype(np.float64)
+        grades = np.array([STAGE_GRADES[s] for s in self.stages], dtype=np.float64)
+        mask = ~np.isnan(y)
+        n = mask.sum(axis=1)
+
+        x = np.where(mask, grades, np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            dx = x - np.nanmean(x, axis=1, keepdims=True)
+            dy = y - np.nanmean(y, axis=1, keepdims=True)
+            slope = np.nansum(dx * dy, axis=1) / np.nansum(dx * dx, axis=1)
+        slope = np.where(n >= 2, slope, np.nan)
+
+        out = self.frame(np.column_stack([y, slope, n]), self.stages + ['Slope_Per_Grade', 'Stages'])
+        out['Stages'] = out['Stages'].astype(int)
+        out['Direction'] = np.select([out['Slope_Per_Grade'] > 0, out['Slope_Per_Grade'] < 0],
+                                     ['improving', 'declining'], 'flat')
+        out.loc[out['Stages'] < 2, 'Direction'] = ''
+        return out[out['Stages'] >= 2].sort_values('Slope_Per_Grade').reset_index(drop=True)
+
+def print_extremes(df, column, label, n=5):
+    print(f"\nLargest drops ({label}):")
+    print(df.nsmallest(n, column).round(2).to_string(index=False))
+    print(f"\nLargest gains ({label}):")
+    print(df.nlargest(n, column).round(2).to_string(index=False))
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('build', 'gap', 'trend') or (args[0] == 'gap' and len(args) < 3):
+        print(__doc__.strip().split('Usage:')[1].rstrip())
+        sys.exit(1)
+
+    matrix = LongitudinalMatrix.load_or_build()
+    command = args[0]
+    if command == 'build':
+        filled = int(np.count_nonzero(matrix.counts))
+        print(f"✓ {MATRIX_FILE}: {len(matrix.districts)} districts x {len(matrix.stages)} stages x "
+              f"{len(matrix.subjects)} subjects, {filled:,} cells filled")
+        print(f"  Subjects at every stage: {', '.join(matrix.common_subjects())}")
+    elif command == 'gap':
+        subjects = [args[3]] if len(args) > 3 else matrix.common_subjects()
+        for subject in subjects:
+            df = matrix.gap(args[1], args[2], subject)
+            filename = f"gap_{canonical_subject(subject).lower().replace(' ', '_')}.csv"
+            df.to_csv(filename, index=False)
+            print(f"\n{subject}: {len(df)} districts with both stages, mean gap {df['Gap'].mean():.2f}")
+            print_extremes(df, 'Gap', subject)
+            print(f"  Saved to {filename}")
+    elif command == 'trend':
+        subjects = [args[1]] if len(args) > 1 else matrix.common_subjects()
+        for subject in subjects:
+            df = matrix.trend(subject)
+            filename = f"trend_{canonical_subject(subject).lower().replace(' ', '_')}.csv"
+            df.to_csv(filename, index=False)
+            counts = df['Direction'].value_counts()
+            print(f"\n{subject}: {counts.get('improving', 0)} improving, "
+                  f"{counts.get('declining', 0)} declining across grades")
+            print_extremes(df, 'Slope_Per_Grade', subject)
+            print(f"  Saved to {filename}")
+
+if __name__ == "__main__":
+    start_from_argv()
+    main()
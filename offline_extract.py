@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Offline extractor for saved dashboard snapshots - no browser needed.
+
+Handles two kinds of files:
+- page/iframe HTML (e.g. page_foundation.html from explore_dashboard.py):
+  streamed through html.parser in chunks to recover the competency accordion
+  (grade, subject headings, "C-X.Y description" items and their values) and
+  the dashboard iframe's areaId
+- dashData JS files (<id>_dashData_<n>.js): scanned for competency labels
+  (same patterns as scrape_parakh.parse_competencies_from_js), <h6> subjects
+  and Highcharts "series" arrays
+
+A directory is processed in a process pool. Output:
+- offline_snapshots.jsonl   - one record per file
+- offline_competencies.csv  - flat competency catalog with values
+
+Usage:
+    python offline_extract.py <file_or_directory> [...]
+"""
+import csv
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from profiling import start_from_argv
+
+CHUNK_SIZE = 1 << 16
+
+OUTPUT_JSONL = 'offline_snapshots.jsonl'
+OUTPUT_CSV = 'offline_competencies.csv'
+
+COMPETENCY = re.compile(r'^(C-\d+\.\d+)\s*(.*)$', re.S)
+GRADE_CLASS = re.compile(r'-g(\d+)\b')
+AREA_ID = re.compile(r'areaId=(IND\d+)')
+
+# dashData JS patterns
+JS_COMPETENCY = re.compile(r'"sg":\{"en":"(C-\d+\.\d+[^"]*)"')
+JS_SUBJECT = re.compile(r'<h6>([^<]+)</h6>')
+JS_SERIES = re.compile(r'"series"\s*:\s*\[')
+JS_TITLE = re.compile(r'"title"\s*:\s*\{\s*"text"\s*:\s*"([^"]*)"')
+
+def parse_value(text):
+    """'55', '55%' or 'N/A' -> float or None."""
+    match = re.search(r'-?\d+(\.\d+)?', text or '')
+    return float(match.group(0)) if match else None
+
+class SnapshotParser(HTMLParser):
+    """Streaming parser for the competency accordion in a dashboard page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.competencies = []
+        self.subjects = []
+        self.area_ids = []
+        self._seen = set()
+        self._grade = None
+        self._subject = None
+        self._in_subject = False
+        self._p_depth = 0
+        self._p_text = []
+        self._in_value = False
+        self._value = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        cls = attrs.get('class') or ''
+        if tag == 'iframe' and attrs.get('src'):
+            match = AREA_ID.search(attrs['src'])
+            if match:
+                self.area_ids.append(match.group(1))
+        if tag == 'div' and '-competency-' in cls:
+            match = GRADE_CLASS.search(cls)
+            if match:
+                self._grade = f"Grade {match.group(1)}"
+        if tag == 'h5' and 'accordion-summary-head-subject' in cls:
+            self._in_subject = True
+            self._subject = ''
+        elif tag == 'p':
+            self._p_depth += 1
+            self._p_text = []
+            self._value = []
+        elif tag == 'span' and 'value' in cls.split() and self._p_depth:
+            self._in_value = True
+
+    def handle_endtag(self, tag):
+        if tag == 'h5' and self._in_subject:
+            self._in_subject = False
+            self._subject = self._subject.strip()
+            if self._subject and self._subject not in self.subjects:
+                self.subjects.append(self._subject)
+        elif tag == 'span' and self._in_value:
+            self._in_value = False
+        elif tag == 'p' and self._p_depth:
+            self._p_depth -= 1
+            match = COMPETENCY.match(''.join(self._p_text).strip())
+            key = match and (self._grade, self._subject, match.group(1))
+            if match and key not in self._seen:
+                self._seen.add(key)
+                self.competencies.append({
+                    'grade': self._grade,
+                    'code': match.group(1),
+                    'description': f"{match.group(1)} {' '.join(match.group(2).split())}".strip(),
+                    'subject': self._subject,
+                    'value': parse_value(''.join(self._value))
+                })
+            self._p_text = []
+
+    def handle_data(self, data):
+        if self._in_subject:
+            self._subject += data
+        elif self._in_value:
+            self._value.append(data)
+        elif self._p_depth:
+            self._p_text.append(data)
+
+def extract_html(path):
+    parser = SnapshotParser()
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), ''):
+            parser.feed(chunk)
+    parser.close()
+    return {
+        'file': path,
+        'type': 'html',
+        'area_id': parser.area_ids[0] if parser.area_ids else None,
+        'subjects': parser.subjects,
+        'competencies': parser.competencies,
+        'charts': []
+    }
+
+def extract_js(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        content = f.read()
+
+    competencies, seen = [], set()
+    for match in JS_COMPETENCY.finditer(content):
+        description = match.group(1).strip()
+        code = description.split()[0]
+        if code not in seen:
+            seen.add(code)
+            competencies.append({'grade': None, 'code': code, 'description': description,
+                                 'subject': None, 'value': None})
+
+    decoder = json.JSONDecoder()
+    charts = []
+    for match in JS_SERIES.finditer(content):
+        try:
+            series, _ = decoder.raw_decode(content, match.end() - 1)
+        except ValueError:
+            continue
+        titles = JS_TITLE.findall(content, max(0, match.start() - 4000), match.start())
+        charts.append({
+            'title': titles[-1] if titles else '',
+            'series': [{
+                'name': s.get('name', ''),
+                'data': [{'name': d.get('name'), 'y': d.get('y')} if isinstance(d, dict)
+                         else {'name': None, 'y': d}
+                         for d in s.get('data', [])]
+            } for s in series if isinstance(s, dict)]
+        })
+
+    return {
+        'file': path,
+        'type': 'js',
+        'area_id': None,
+        'subjects': sorted(set(s.strip() for s in JS_SUBJECT.findall(content))),
+        'competencies': competencies,
+        'charts': charts
+    }
+
+def extract_file(path):
+    """Extract one snapshot file (process pool worker)."""
+    try:
+        if path.endswith('.js'):
+            return extract_js(path)
+        return extract_html(path)
+    except Exception as e:
+        return {'file': path, 'error': str(e)}
+
+def find_snapshots(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names)
+                             if n.endswith(('.html', '.htm', '.js')))
+        else:
+            files.append(path)
+    return files
+
+def extract_all(paths, workers=None):
+    """Extract every snapshot under `paths` and write the outputs."""
+    files = find_snapshots(paths)
+    print(f"Extracting {len(files)} snapshot files...")
+
+    records = errors = competencies = 0
+    with open(OUTPUT_JSONL, 'w') as out, open(OUTPUT_CSV, 'w', newline='') as csv_out:
+        writer = csv.writer(csv_out)
+        writer.writerow(['File', 'Area_ID', 'Grade', 'Subject', 'Competency_Code',
+                         'Competency_Description', 'Value'])
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for record in pool.map(extract_file, files, chunksize=16):
+                out.write(json.dumps(record) + '\n')
+                records += 1
+                if 'error' in record:
+                    errors += 1
+                    continue
+                for c in record['competencies']:
+                    writer.writerow([record['file'], record['area_id'], c['grade'],
+                                     c['subject'], c['code'], c['description'], c['value']])
+                    competencies += 1
+
+    print(f"✓ {records} files ({errors} errors), {competencies} competency rows")
+    print(f"  Saved {OUTPUT_JSONL} and {OUTPUT_CSV}")
+
+if __name__ == "__main__":
+    start_from_argv()
+    if len(sys.argv) < 2:
+        print("Usage: python offline_extract.py <file_or_directory> [...]")
+        sys.exit(1)
+    extract_all(sys.argv[1:])
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the PARAKH pipeline.
+
+    python parakh.py scrape <group_number|all|worker> [options]
+    python parakh.py convert <group_number|all>
+    python parakh.py combine [--from-json]
+    python parakh.py finalize
+    python parakh.py validate [csv_file] [--update-baseline]
+
+Any command also accepts --profile=cpu|mem|async (see profiling.py).
+
+Only argparse is imported at startup. pandas, Playwright and the step modules
+are imported inside each subcommand, so --help and usage errors return
+immediately. bench_startup.py keeps it that way.
+"""
+import argparse
+import sys
+from profiling import start_from_argv
+
+def cmd_scrape(args):
+    import asyncio
+    import scrape_groups
+
+    sys.argv = ['scrape_groups.py'] + args.scrape_args
+    asyncio.run(scrape_groups.main())
+
+def cmd_convert(args):
+    import convert_group_to_csv
+
+    if args.group == 'all':
+        convert_group_to_csv.convert_all_to_csv()
+    else:
+        convert_group_to_csv.json_to_csv(f'group{args.group}_results.json',
+                                         f'group{args.group}_data.csv')
+
+def cmd_combine(args):
+    import combine_all_csvs
+
+    if args.from_json:
+        from convert_group_to_csv import convert_all
+        combine_all_csvs.combine_csvs(convert_all())
+    else:
+        combine_all_csvs.combine_csvs()
+
+def cmd_finalize(args):
+    import create_final_csvs
+
+    create_final_csvs.main()
+
+def cmd_validate(args):
+    import validate_data
+
+    report = validate_data.run_validation(args.csv_file, update_baseline=args.update_baseline)
+    sys.exit(0 if report['passed'] else 1)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='parakh', description='PARAKH dashboard scraping pipeline',
+                                     epilog='Any command also accepts --profile=cpu|mem|async.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('scrape', help='scrape a group of states (see scrape_groups.py)')
+    p.add_argument('scrape_args', nargs=argparse.REMAINDER,
+                   help='<group_number|all|worker> [--districts] [--compact] [--chunk-size N] [--delta] [--status-port N]')
+    p.set_defaults(func=cmd_scrape, usage_error=p.error)
+
+    p = sub.add_parser('convert', help='convert group JSON results to CSV')
+    p.add_argument('group', help="group number, or 'all' to convert every group in parallel")
+    p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser('combine', help='combine group CSVs into parakh_competency_data_all.csv')
+    p.add_argument('--from-json', action='store_true',
+                   help='convert group JSON in memory instead of reading group CSVs')
+    p.set_defaults(func=cmd_combine)
+
+    p = sub.add_parser('finalize', help='create the 3 per-stage CSVs from all_results.json')
+    p.set_defaults(func=cmd_finalize)
+
+    p = sub.add_parser('validate', help='run data-quality checks on the combined CSV')
+    p.add_argument('csv_file', nargs='?', default='parakh_competency_data_all.csv')
+    p.add_argument('--update-baseline', action='store_true',
+                   help='store district counts for the next run if checks pass')
+    p.set_defaults(func=cmd_validate)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'scrape' and not args.scrape_args:
+        # REMAINDER never fails on its own, so report the missing argument like any other
+        args.usage_error('the following arguments are required: <group_number|all|worker>')
+    args.func(args)
+
+if __name__ == "__main__":
+    start_from_argv()
+    main()
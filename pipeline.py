@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Make-style pipeline runner for the whole PARAKH flow:
+
+    scrape (6 groups) -> convert (6 groups) -> combine (+ validation) -> reports
+    all_results.json  -> stage CSVs -> rankings
+
+Each node declares its command, input files and output files. A node's
+script inputs are its script plus every local module it imports, found by
+walking the imports (script_inputs), so the lists stay current; data files
+the scripts read (area cache, district registry, validation baseline) are
+inputs too. A node is skipped when the content hash of its inputs matches the
+last successful run and its outputs exist. Independent nodes run in
+parallel; combine waits for stage_csvs because both update
+district_registry.json.
+
+Usage:
+    python pipeline.py [target ...] [--dry-run] [--force] [--jobs N]
+"""
+import ast
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from profiling import start_from_argv
+
+STATE_FILE = '.pipeline_state.json'
+GROUPS = range(1, 7)
+
+def script_inputs(script):
+    """`script` plus every local .py module it imports, transitively."""
+    found, todo = [], [script]
+    while todo:
+        path = todo.pop()
+        if path in found or not os.path.exists(path):
+            continue
+        found.append(path)
+        with open(path, 'r') as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            todo.extend(f"{name.split('.')[0]}.py" for name in names)
+    return sorted(found)
+
+def build_nodes():
+    """The pipeline DAG: name -> {cmd, inputs, outputs, deps}."""
+    py = sys.executable
+    nodes = {}
+    for n in GROUPS:
+        nodes[f'scrape{n}'] = {
+            'cmd': [py, 'scrape_groups.py', str(n)],
+            'inputs': script_inputs('scrape_groups.py'),
+            'outputs': [f'group{n}_results.json'],
+            'deps': []
+        }
+        nodes[f'convert{n}'] = {
+            'cmd': [py, 'convert_group_to_csv.py', str(n)],
+            'inputs': script_inputs('convert_group_to_csv.py') + [f'group{n}_results.json', 'area_data.json'],
+            'outputs': [f'group{n}_data.csv'],
+            'deps': [f'scrape{n}']
+        }
+    nodes['stage_csvs'] = {
+        'cmd': [py, 'create_final_csvs.py'],
+        'inputs': script_inputs('create_final_csvs.py') + ['all_results.json', 'district_registry.json'],
+        'outputs': ['foundational_stage.csv', 'preparatory_stage.csv', 'middle_stage.csv'],
+        'deps': []
+    }
+    nodes['combine'] = {
+        'cmd': [py, 'combine_all_csvs.py'],
+        'inputs': script_inputs('combine_all_csvs.py') + ['parakh_competency_data.csv', 'group*_data.csv',
+                                                           'district_registry.json', 'validation_baseline.json'],
+        'outputs': ['parakh_competency_data_all.csv'],
+        # stage_csvs also loads and saves district_registry.json
+        'deps': [f'convert{n}' for n in GROUPS] + ['stage_csvs']
+    }
+    nodes['reports'] = {
+        'cmd': [py, 'generate_reports.py'],
+        'inputs': script_inputs('generate_reports.py') + ['parakh_competency_data_all.csv'],
+        'outputs': ['state_coverage_and_distribution.png', 'state_subject_heatmap.png',
+                    'state_performance_comparison.png', 'stage_performance_chart.png'],
+        'deps': ['combine']
+    }
+    nodes['rankings'] = {
+        'cmd': [py, 'build_rankings.py'],
+        'inputs': script_inputs('build_rankings.py') + ['foundational_stage.csv', 'preparatory_stage.csv',
+                                                         'middle_stage.csv'],
+        'outputs': ['district_rankings.csv', 'state_stats.csv', 'subject_rollups.csv'],
+        'deps': ['stage_csvs']
+    }
+    return nodes
+
+def resolve(patterns):
+    """Expand glob patterns; plain names are kept even if missing."""
+    files = []
+    for pattern in patterns:
+        if any(c in pattern for c in '*?['):
+            files.extend(sorted(glob.glob(pattern)))
+        else:
+            files.append(pattern)
+    return files
+
+def file_hash(path):
+    if not os.path.exists(path):
+        return 'missing'
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def inputs_hash(node):
+    """Combined hash of a node's command and input files."""
+    h = hashlib.sha256(' '.join(node['cmd'][1:]).encode())
+    for path in resolve(node['inputs']):
+        h.update(path.encode())
+        h.update(file_hash(path).encode())
+    return h.hexdigest()
+
+def load_state():
+    if os.path.exists(STATE_FILE):
+        with open(STATE_FILE, 'r') as f:
+            return json.load(f)
+    return {}
+
+def save_state(state):
+    with open(STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+def is_stale(name, node, state):
+    if not all(os.path.exists(p) for p in node['outputs']):
+        return True
+    return state.get(name) != inputs_hash(node)
+
+def select(nodes, targets):
+    """Targets plus all their upstream nodes (everything when no targets)."""
+    if not targets:
+        return list(nodes)
+    selected = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in nodes:
+            raise SystemExit(f"Unknown target: {name}. Available: {', '.join(nodes)}")
+        if name not in selected:
+            selected.add(name)
+            stack.extend(nodes[name]['deps'])
+    return [n for n in nodes if n in selected]
+
+def dry_run(nodes, names, state, force=False):
+    """Print which nodes would rebuild; downstream of a rebuild counts as rebuilt."""
+    rebuild = set()
+    for name in names:
+        node = nodes[name]
+        reason = None
+        if force:
+            reason = 'forced'
+        elif any(d in rebuild for d in node['deps']):
+            reason = 'upstream changed'
+        elif is_stale(name, node, state):
+            missing = [p for p in node['outputs'] if not os.path.exists(p)]
+            reason = f"missing {', '.join(missing)}" if missing else 'inputs changed'
+        if reason:
+            rebuild.add(name)
+            print(f"  REBUILD  {name:12s} ({reason})")
+        else:
+            print(f"  skip     {name:12s}")
+    print(f"\n{len(rebuild)} of {len(names)} nodes would run")
+
+def run_node(name, node):
+    print(f"  → {name}: {' '.join(node['cmd'][1:])}")
+    result = subprocess.run(node['cmd'], capture_output=True, text=True)
+    with open(f'.pipeline_{name}.log', 'w') as f:
+        f.write(result.stdout)
+        f.write(result.stderr)
+    return result.returncode
+
+def run(nodes, names, state, force=False, jobs=4):
+    """Run stale nodes in dependency order, independent ones in parallel."""
+    pending = list(names)
+    done, failed = set(), set()
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for name in list(pending):
+                deps = [d for d in nodes[name]['deps'] if d in names]
+                if any(d in failed for d in deps):
+                    pending.remove(name)
+                    failed.add(name)
+                    print(f"  ✗ {name}: skipped, upstream failed")
+                elif all(d in done for d in deps):
+                    pending.remove(name)
+                    node = nodes[name]
+                    if not force and not is_stale(name, node, state):
+                        done.add(name)
+                        print(f"  - {name}: up to date")
+                        continue
+                    node_hash = inputs_hash(node)
+                    running[pool.submit(run_node, name, node)] = (name, node_hash)
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, node_hash = running.pop(future)
+                if future.result() == 0 and all(os.path.exists(p) for p in nodes[name]['outputs']):
+                    state[name] = node_hash
+                    save_state(state)
+                    done.add(name)
+                    print(f"  ✓ {name}")
+                else:
+                    failed.add(name)
+                    print(f"  ✗ {name}: failed (see .pipeline_{name}.log)")
+    return not failed
+
+def main():
+    args = sys.argv[1:]
+    dry = '--dry-run' in args
+    force = '--force' in args
+    jobs = 4
+    if '--jobs' in args:
+        i = args.index('--jobs')
+        jobs = int(args[i + 1])
+        del args[i:i + 2]
+    targets = [a for a in args if not a.startswith('--')]
+
+    nodes = build_nodes()
+    names = select(nodes, targets)
+    state = load_state()
+
+    print(f"{'='*60}")
+    print(f"Pipeline: {len(names)} nodes{' (dry run)' if dry else ''}")
+    print(f"{'='*60}")
+
+    if dry:
+        dry_run(nodes, names, state, force)
+        return
+    ok = run(nodes, names, state, force, jobs)
+    print(f"{'='*60}")
+    print("✓ Pipeline complete" if ok else "✗ Pipeline finished with failures")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    start_from_argv()
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Profiling hooks shared by every entry point: --profile=cpu|mem|async
+
+- cpu:   cProfile (saved as profile_<name>.pstats) plus a stack sampler
+         for flamegraphs
+- mem:   tracemalloc snapshot taken at peak traced memory, so allocation
+         sites such as row-dict building show up before they are freed
+- async: wall time of every asyncio task, nested under the task that
+         created it; the flamegraph weight of a task is its wall time not
+         covered by any of its child tasks, so concurrent children are not
+         double-counted
+
+Each mode writes profile_<name>_<mode>.collapsed in the collapsed-stack format
+("frame;frame;frame weight" per line) read by flamegraph.pl and speedscope.
+
+Entry points call start_from_argv() first thing in their __main__ block. It
+strips --profile from sys.argv, starts the profiler, and reports at exit.
+Heavy imports happen only when a profile is requested.
+"""
+import atexit
+import os
+import sys
+from collections import Counter
+
+MODES = ('cpu', 'mem', 'async')
+SAMPLE_INTERVAL = 0.005
+MEM_POLL_INTERVAL = 0.05
+MEM_SNAPSHOT_GROWTH = 1.1
+TRACEBACK_DEPTH = 30
+
+def extract_profile_flag(args):
+    """Split --profile=MODE / --profile MODE out of args."""
+    mode, rest = None, []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg.startswith('--profile='):
+            mode = arg.split('=', 1)[1]
+        elif arg == '--profile' and i + 1 < len(args):
+            mode = args[i + 1]
+            i += 1
+        else:
+            rest.append(arg)
+        i += 1
+    if mode is not None and mode not in MODES:
+        raise SystemExit(f"--profile must be one of: {', '.join(MODES)}")
+    return mode, rest
+
+def write_collapsed(stacks, filename):
+    with open(filename, 'w') as f:
+        for stack, weight in stacks.most_common():
+            if weight > 0:
+                f.write(f"{';'.join(stack)} {int(weight)}\n")
+
+def covered_length(intervals, start, end):
+    """Length of the union of (lo, hi) intervals, clipped to [start, end]."""
+    total, reach = 0.0, start
+    for lo, hi in sorted(intervals):
+        lo, hi = max(lo, reach), min(hi, end)
+        if hi > lo:
+            total += hi - lo
+            reach = hi
+    return total
+
+def frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class CpuProfile:
+    """cProfile for pstats, plus a sampler of the main thread's stack."""
+
+    def __init__(self, name):
+        import cProfile
+        import threading
+
+        self.name = name
+        self.profiler = cProfile.Profile()
+        self.stacks = Counter()
+        self.thread_id = threading.get_ident()
+        self.stopped = threading.Event()
+        self.sampler = threading.Thread(target=self.sample, daemon=True)
+
+    def sample(self):
+        while not self.stopped.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def start(self):
+        self.sampler.start()
+        self.profiler.enable()
+
+    def stop(self):
+        import pstats
+
+        self.profiler.disable()
+        self.stopped.set()
+        self.sampler.join()
+        self.profiler.dump_stats(f'profile_{self.name}.pstats')
+        write_collapsed(self.stacks, f'profile_{self.name}_cpu.collapsed')
+
+        print(f"\n{'='*60}\nCPU profile (top 15 by cumulative time):")
+        pstats.Stats(self.profiler, stream=sys.stdout).sort_stats('cumulative').print_stats(15)
+        print(f"Saved profile_{self.name}.pstats and profile_{self.name}_cpu.collapsed "
+              f"({sum(self.stacks.values())} samples)")
+
+class MemProfile:
+    """tracemalloc, snapshotting whenever traced memory reaches a new high."""
+
+    def __init__(self, name):
+        import threading
+        import tracemalloc
+
+        self.name = name
+        self.tracemalloc = tracemalloc
+        self.peak_snapshot = None
+        self.snapshot_size = 0
+        self.stopped = threading.Event()
+        self.monitor = threading.Thread(target=self.watch, daemon=True)
+
+    def take_snapshot(self):
+        current, _ = self.tracemalloc.get_traced_memory()
+        if current > self.snapshot_size * MEM_SNAPSHOT_GROWTH:
+            self.peak_snapshot = self.tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+    def watch(self):
+        while not self.stopped.wait(MEM_POLL_INTERVAL):
+            self.take_snapshot()
+
+    def start(self):
+        self.tracemalloc.start(TRACEBACK_DEPTH)
+        self.monitor.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.monitor.join()
+        self.take_snapshot()
+        _, peak = self.tracemalloc.get_traced_memory()
+        self.tracemalloc.stop()
+
+        snapshot = self.peak_snapshot.filter_traces([
+            self.tracemalloc.Filter(False, self.tracemalloc.__file__),
+            self.tracemalloc.Filter(False, __file__, all_frames=True),
+            self.tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ])
+        stacks = Counter()
+        for stat in snapshot.statistics('traceback'):
+            stack = tuple(f"{os.path.basename(f.filename)}:{f.lineno}" for f in stat.traceback)
+            stacks[stack] += stat.size
+        write_collapsed(stacks, f'profile_{self.name}_mem.collapsed')
+
+        print(f"\n{'='*60}\nMemory: peak {peak / 1e6:.1f} MB. "
+              f"Top allocation sites at {self.snapshot_size / 1e6:.1f} MB:")
+        for stat in snapshot.statistics('lineno')[:10]:
+            frame = stat.traceback[0]
+            print(f"  {stat.size / 1e6:8.2f} MB  {stat.count:9,} blocks  "
+                  f"{os.path.basename(frame.filename)}:{frame.lineno}")
+        print(f"Saved profile_{self.name}_mem.collapsed (weights in bytes)")
+
+class AsyncProfile:
+    """Task factory on every new event loop that times each asyncio task."""
+
+    def __init__(self, name):
+        import asyncio
+
+        self.name = name
+        self.asyncio = asyncio
+        self.running = {}
+        self.finished = []
+        self.next_id = 0
+        self.durations = Counter()
+        self.counts = Counter()
+        self.previous_policy = None
+
+    def create_task(self, loop, coro, **kwargs):
+        import time
+
+        parent = self.running.get(self.asyncio.current_task(loop) if loop.is_running() else None)
+        info = {
+            'id': self.next_id,
+            'parent': parent['id'] if parent else None,
+            'path': (parent['path'] if parent else ()) + (getattr(coro, '__qualname__', type(coro).__name__),),
+            'start': time.perf_counter()
+        }
+        self.next_id += 1
+        task = self.asyncio.Task(coro, loop=loop, **kwargs)
+        self.running[task] = info
+
+        def done(t):
+            info['end'] = time.perf_counter()
+            self.durations[info['path']] += (info['end'] - info['start']) * 1000
+            self.counts[info['path']] += 1
+            self.finished.append(info)
+            self.running.pop(t, None)
+
+        task.add_done_callback(done)
+        return task
+
+    def start(self):
+        profile = self
+
+        class TimingPolicy(self.asyncio.DefaultEventLoopPolicy):
+            def new_event_loop(self):
+                loop = super().new_event_loop()
+                loop.set_task_factory(profile.create_task)
+                return loop
+
+        self.previous_policy = self.asyncio.get_event_loop_policy()
+        self.asyncio.set_event_loop_policy(TimingPolicy())
+
+    def stop(self):
+        self.asyncio.set_event_loop_policy(self.previous_policy)
+
+        # Collapsed weights are self time: a task's wall time minus the union
+        # of its children's intervals, since children may run concurrently
+        children = {}
+        for info in self.finished:
+            if info['parent'] is not None:
+                children.setdefault(info['parent'], []).append((info['start'], info['end']))
+        self_time = Counter()
+        for info in self.finished:
+            covered = covered_length(children.get(info['id'], []), info['start'], info['end'])
+            self_time[info['path']] += max(info['end'] - info['start'] - covered, 0) * 1000
+        write_collapsed(self_time, f'profile_{self.name}_async.collapsed')
+
+        print(f"\n{'='*60}\nAsyncio tasks (total wall time, count, creation path):")
+        for path, ms in self.durations.most_common(15):
+            print(f"  {ms:10.1f} ms  x{self.counts[path]:<5} {' > '.join(path)}")
+        print(f"Saved profile_{self.name}_async.collapsed (weights in ms)")
+
+PROFILERS = {'cpu': CpuProfile, 'mem': MemProfile, 'async': AsyncProfile}
+
+def start_from_argv(name=None):
+    """Strip --profile from sys.argv and, if given, profile until exit."""
+    mode, sys.argv[1:] = extract_profile_flag(sys.argv[1:])
+    if mode is None:
+        return None
+    name = name or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    profile = PROFILERS[mode](name)
+    profile.start()
+    atexit.register(profile.stop)
+    return profile
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Local read-only HTTP service over parakh_competency_data_all.csv.
+
+The CSV is loaded once into a columnar DataFrame (categorical columns) and
+served over plain asyncio - no web framework needed. Endpoints:
+
+    GET /health
+    GET /scores?state=&district=&stage=&subject=&competency=&limit=
+    GET /aggregate?by=State,Subject&agg=mean&<same filters>
+
+Responses carry an ETag (data version + query), so clients can send
+If-None-Match and get 304. Rendered responses are kept in an LRU cache keyed
+by data version, and the file is watched: a new combined CSV is loaded in the
+background and swapped in atomically, so there is no downtime. A load is
+dropped if the file changed while it was being read (a writer still busy) and
+retried on the next poll.
+
+Usage:
+    python query_service.py [csv_file] [--port 8765]
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+
+import pandas as pd
+from profiling import start_from_argv
+
+INPUT_FILE = 'parakh_competency_data_all.csv'
+PORT = 8765
+RELOAD_INTERVAL = 5
+CACHE_SIZE = 512
+
+FILTERS = {
+    'state': 'State',
+    'district': 'District',
+    'stage': 'Stage',
+    'subject': 'Subject',
+    'competency': 'Competency_Code'
+}
+AGGREGATIONS = {'mean', 'median', 'min', 'max', 'std', 'count'}
+CATEGORICAL = ['State', 'State_Code', 'District', 'Stage', 'Subject', 'Competency_Code']
+
+class Dataset:
+    """An immutable loaded version of the CSV."""
+
+    def __init__(self, path):
+        stat = os.stat(path)
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        df = pd.read_csv(path)
+        # A writer may still have been writing: only keep a load whose file
+        # did not change while it was read
+        stat = os.stat(path)
+        if (stat.st_mtime_ns, stat.st_size) != self.signature:
+            raise ValueError(f"{path} changed while loading")
+        for col in CATEGORICAL:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        self.df = df
+        self.version = hashlib.sha1(repr(self.signature).encode()).hexdigest()[:12]
+
+class LRUCache:
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.items = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        if key in self.items:
+            self.items.move_to_end(key)
+            self.hits += 1
+            return self.items[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        if len(self.items) > self.size:
+            self.items.popitem(last=False)
+
+class QueryService:
+    def __init__(self, path):
+        self.path = path
+        self.data = Dataset(path)
+        self.cache = LRUCache()
+
+    def filtered(self, params):
+        df = self.data.df
+        mask = pd.Series(True, index=df.index)
+        for param, col in FILTERS.items():
+            if param in params:
+                mask &= df[col].isin(params[param])
+        return df[mask]
+
+    def scores(self, params):
+        df = self.filtered(params)
+        limit = int(params.get('limit', ['1000'])[0])
+        return {'total': len(df), 'rows': json.loads(df.head(limit).to_json(orient='records'))}
+
+    def aggregate(self, params):
+        by = [FILTERS.get(b.lower(), b) for b in params.get('by', ['State'])[0].split(',')]
+        agg = params.get('agg', ['mean'])[0]
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"agg must be one of {sorted(AGGREGATIONS)}")
+        df = self.filtered(params)
+        missing = [b for b in by if b not in df.columns]
+        if missing:
+            raise ValueError(f"unknown group-by column(s): {missing}")
+        result = (df.groupby(by, observed=True)['Score_Percent'].agg(agg)
+                  .round(2).rename('Score').reset_index())
+        return {'by': by, 'agg': agg, 'rows': json.loads(result.to_json(orient='records'))}
+
+    def handle(self, path, query):
+        """Return (status, body bytes, etag) for a GET request."""
+        if path == '/health':
+            body = {'status': 'ok', 'version': self.data.version, 'rows': len(self.data.df),
+                    'cache': {'size': len(self.cache.items), 'hits': self.cache.hits,
+                              'misses': self.cache.misses}}
+            return 200, json.dumps(body).encode(), None
+
+        params = parse_qs(query)
+        key_query = '&'.join(f"{k}={','.join(sorted(v))}" for k, v in sorted(params.items()))
+        version = self.data.version
+        etag = '"' + hashlib.sha1(f"{version}:{path}?{key_query}".encode()).hexdigest()[:16] + '"'
+
+        cached = self.cache.get(etag)
+        if cached is not None:
+            return 200, cached, etag
+
+        if path == '/scores':
+            body = self.scores(params)
+        elif path == '/aggregate':
+            body = self.aggregate(params)
+        else:
+            return 404, json.dumps({'error': 'not found'}).encode(), None
+
+        payload = json.dumps(body).encode()
+        self.cache.put(etag, payload)
+        return 200, payload, etag
+
+    async def watch(self, interval=RELOAD_INTERVAL):
+        """Reload in the background when the CSV changes, then swap atomically."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                continue
+            if (stat.st_mtime_ns, stat.st_size) == self.data.signature:
+                continue
+            try:
+                data = await loop.run_in_executor(None, Dataset, self.path)
+            except Exception as e:
+                print(f"  Reload failed, keeping version {self.data.version}: {e}")
+                continue
+            self.data = data
+            print(f"  Reloaded {self.path}: version {data.version}, {len(data.df):,} rows")
+
+    async def serve_client(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                if method != 'GET':
+                    status, body, etag = 405, b'{"error": "method not allowed"}', None
+                else:
+                    url = urlsplit(target)
+                    try:
+                        status, body, etag = self.handle(url.path, url.query)
+                    except ValueError as e:
+                        status, body, etag = 400, json.dumps({'error': str(e)}).encode(), None
+
+                if etag and headers.get('if-none-match') == etag:
+                    status, body = 304, b''
+
+                reason = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request',
+                          404: 'Not Found', 405: 'Method Not Allowed'}[status]
+                head = [f"HTTP/1.1 {status} {reason}",
+                        "Content-Type: application/json",
+                        f"Content-Length: {len(body)}"]
+                if etag:
+                    head.append(f"ETag: {etag}")
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + body)
+                await writer.drain()
+
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(path=INPUT_FILE, port=PORT):
+    service = QueryService(path)
+    server = await asyncio.start_server(service.serve_client, '127.0.0.1', port)
+    print(f"Serving {path} ({len(service.data.df):,} rows) on http://127.0.0.1:{port}")
+    # Keep a reference: the event loop only holds tasks weakly
+    service.watcher = asyncio.create_task(service.watch())
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    start_from_argv()
+    args = sys.argv[1:]
+    port = PORT
+    if '--port' in args:
+        i = args.index('--port')
+        port = int(args[i + 1])
+        del args[i:i + 2]
+    if len(args) > 1:
+        print("Usage: python query_service.py [csv_file] [--port 8765]")
+        sys.exit(1)
+    asyncio.run(serve(args[0] if args else INPUT_FILE, port))
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Compressed archive of raw scrape captures with random access per state/stage.
+
+Raw outputs (group{X}_results.json, all_results.json, all_results_complete.json)
+are split by (state, stage) and each slice is stored as one compressed frame
+in raw_archive.bin. raw_archive.index.json records the offset and length of
+every frame, so reading one state's data decompresses only its frames.
+
+Captures are append-only: adding a new capture appends frames and index
+entries, and the newest frame for a (state, stage) wins on read.
+
+Frames use zstd when the zstandard package is installed, otherwise zlib; the
+codec is recorded per frame.
+
+Usage:
+    python raw_archive.py add <json_file> [...]
+    python raw_archive.py list
+    python raw_archive.py extract <state> [stage]
+    python raw_archive.py process <state>
+"""
+import json
+import os
+import sys
+import zlib
+from datetime import datetime
+from profiling import start_from_argv
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_FILE = 'raw_archive.bin'
+INDEX_FILE = 'raw_archive.index.json'
+ZSTD_LEVEL = 10
+
+def compress(payload):
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    return 'zlib', zlib.compress(payload, 9)
+
+def decompress(codec, blob):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Frame is zstd-compressed; install the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return zlib.decompress(blob)
+
+def load_index(index_file=INDEX_FILE):
+    if os.path.exists(index_file):
+        with open(index_file, 'r') as f:
+            return json.load(f)
+    return []
+
+def save_index(index, index_file=INDEX_FILE):
+    tmp = index_file + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp, index_file)
+
+def group_records(records):
+    """Split raw records by (state, stage), keeping their order."""
+    slices = {}
+    for record in records:
+        key = (record.get('state', ''), record.get('stage', ''))
+        slices.setdefault(key, []).append(record)
+    return slices
+
+def append_capture(json_file, archive_file=ARCHIVE_FILE, index_file=INDEX_FILE):
+    """Append one raw JSON capture to the archive. Returns the number of frames."""
+    with open(json_file, 'r') as f:
+        records = json.load(f)
+
+    index = load_index(index_file)
+    slices = group_records(records)
+    added = datetime.now().isoformat()
+    with open(archive_file, 'ab') as out:
+        for (state, stage), slice_records in slices.items():
+            codec, blob = compress(json.dumps(slice_records, separators=(',', ':')).encode())
+            offset = out.tell()
+            out.write(blob)
+            index.append({
+                'state': state,
+                'stage': stage,
+                'offset': offset,
+                'length': len(blob),
+                'codec': codec,
+                'records': len(slice_records),
+                'source': os.path.basename(json_file),
+                'added': added
+            })
+    save_index(index, index_file)
+    return len(slices)
+
+def latest_frames(index, states=None, stages=None):
+    """Newest index entry per (state, stage), filtered."""
+    latest = {}
+    for entry in index:
+        if states and entry['state'] not in states:
+            continue
+        if stages and entry['stage'] not in stages:
+            continue
+        latest[(entry['state'], entry['stage'])] = entry
+    return list(latest.values())
+
+def read_records(states=None, stages=None, archive_file=ARCHIVE_FILE, index_file=INDEX_FILE):
+    """Decompress only the requested (state, stage) slices."""
+    records = []
+    frames = sorted(latest_frames(load_index(index_file), states, stages), key=lambda e: e['offset'])
+    with open(archive_file, 'rb') as f:
+        for entry in frames:
+            f.seek(entry['offset'])
+            records.extend(json.loads(decompress(entry['codec'], f.read(entry['length']))))
+    return records
+
+def process_state(state):
+    """Rebuild one state's stage frames in the stage-CSV columns.
+
+    all_results.json-style entries (with 'charts') go through
+    create_final_csvs.process_stage. Flat group records (group*_results.json,
+    all_results_complete.json) go through convert_group_to_csv.records_to_frame.
+    """
+    import pandas as pd
+    from convert_group_to_csv import records_to_frame
+    from create_final_csvs import process_stage
+
+    data = read_records(states={state})
+    chart_entries = [r for r in data if 'charts' in r]
+    flat_records = [r for r in data if 'charts' not in r]
+
+    flat = records_to_frame(flat_records) if flat_records else pd.DataFrame()
+    if not flat.empty:
+        flat = flat.rename(columns={'Competency_Code': 'LO_Code', 'Competency_Description': 'Description',
+                                    'Score_Percent': 'Score'})
+
+    frames = {}
+    for stage in ['Foundational Stage', 'Preparatory Stage', 'Middle Stage']:
+        parts = [process_stage(chart_entries, stage)]
+        if not flat.empty:
+            parts.append(flat.loc[flat['Stage'] == stage,
+                                  ['State', 'District', 'Subject', 'LO_Code', 'Description', 'Score']])
+        parts = [p for p in parts if not p.empty]
+        frames[stage] = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    return frames
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('add', 'list', 'extract', 'process'):
+        print(__doc__.strip().split('Usage:')[1].rstrip())
+        sys.exit(1)
+
+    command = args[0]
+    if command == 'add':
+        for json_file in args[1:]:
+            frames = append_capture(json_file)
+            print(f"✓ Added {json_file}: {frames} state/stage frames")
+    elif command == 'list':
+        index = load_index()
+        for entry in latest_frames(index):
+            print(f"  {entry['state']} - {entry['stage']}: {entry['records']} records, "
+                  f"{entry['length']:,} bytes ({entry['codec']}, {entry['source']})")
+        print(f"{len(index)} frames, {os.path.getsize(ARCHIVE_FILE) if index else 0:,} bytes")
+    elif command == 'extract':
+        stages = {args[2]} if len(args) > 2 else None
+        json.dump(read_records({args[1]}, stages), sys.stdout, indent=2)
+    elif command == 'process':
+        for stage, df in process_state(args[1]).items():
+            print(f"  {stage}: {len(df)} rows")
+
+if __name__ == "__main__":
+    start_from_argv()
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Dense score cube compiled from parakh_competency_data_all.csv.
+
+The cube is a float32 array of shape (district, stage, competency) with NaN
+for missing cells, saved as score_cube.npy. Sidecar score_cube_index.json
+holds the axis labels (districts as [State, District], stages, competency
+codes) and the district range of each state.
+
+Loading memory-maps the .npy file, so it is near-instant and shared between
+processes through the page cache. Lookups are O(1) index arithmetic and
+cross-stage/cross-competency comparisons are plain NumPy slicing:
+
+    cube = ScoreCube.load()
+    cube.get('Kerala', 'Kollam', 'Middle Stage', 'C-1.1')
+    cube.state('Kerala')[:, cube.stage_index['Middle Stage']]
+
+Usage:
+    python score_cube.py [csv_file]
+"""
+import json
+import re
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+from profiling import start_from_argv
+
+INPUT_FILE = 'parakh_competency_data_all.csv'
+CUBE_FILE = 'score_cube.npy'
+INDEX_FILE = 'score_cube_index.json'
+
+STAGE_ORDER = ['Foundational Stage', 'Preparatory Stage', 'Middle Stage']
+
+def competency_sort_key(code):
+    """C-8.10 sorts after C-8.9; anything unparseable sorts last."""
+    match = re.match(r'C-(\d+)\.?(\d*)', str(code))
+    if not match:
+        return (float('inf'), 0, str(code))
+    return (int(match.group(1)), int(match.group(2) or 0), str(code))
+
+def build_cube(df):
+    """Build (cube, index) from a combined-format frame."""
+    df = df.dropna(subset=['State', 'District', 'Competency_Code', 'Score_Percent'])
+
+    # '\x1f' sorts before any printable character, so codes are ordered by State then District
+    district_codes, district_keys = pd.factorize(df['State'] + '\x1f' + df['District'], sort=True)
+    stages = pd.Categorical(df['Stage'], categories=STAGE_ORDER)
+    comp_codes = sorted(df['Competency_Code'].unique(), key=competency_sort_key)
+    comps = pd.Categorical(df['Competency_Code'], categories=comp_codes)
+
+    cube = np.full((len(district_keys), len(STAGE_ORDER), len(comp_codes)),
+                   np.nan, dtype=np.float32)
+    valid = (stages.codes >= 0) & (comps.codes >= 0)
+    cube[district_codes[valid], stages.codes[valid], comps.codes[valid]] = \
+        df['Score_Percent'].to_numpy(dtype=np.float32)[valid]
+
+    district_labels = [key.split('\x1f') for key in district_keys]
+    states = {}
+    for i, (state, _) in enumerate(district_labels):
+        start, _ = states.get(state, (i, i))
+        states[state] = (start, i + 1)
+
+    index = {
+        'shape': list(cube.shape),
+        'districts': district_labels,
+        'states': {s: list(r) for s, r in states.items()},
+        'stages': STAGE_ORDER,
+        'competencies': comp_codes
+    }
+    return cube, index
+
+def save_cube(cube, index, cube_file=CUBE_FILE, index_file=INDEX_FILE):
+    np.save(cube_file, cube)
+    with open(index_file, 'w') as f:
+        json.dump(index, f, indent=1)
+
+class ScoreCube:
+    """Memory-mapped cube with label lookups."""
+
+    def __init__(self, cube, index):
+        self.cube = cube
+        self.index = index
+        self.district_index = {tuple(d): i for i, d in enumerate(index['districts'])}
+        self.stage_index = {s: i for i, s in enumerate(index['stages'])}
+        self.competency_index = {c: i for i, c in enumerate(index['competencies'])}
+        self.state_ranges = {s: slice(*r) for s, r in index['states'].items()}
+
+    @classmethod
+    def load(cls, cube_file=CUBE_FILE, index_file=INDEX_FILE):
+        with open(index_file, 'r') as f:
+            index = json.load(f)
+        return cls(np.load(cube_file, mmap_mode='r'), index)
+
+    def get(self, state, district, stage, competency):
+        """Score for one cell (NaN if missing); KeyError for unknown labels."""
+        return float(self.cube[self.district_index[(state, district)],
+                               self.stage_index[stage],
+                               self.competency_index[competency]])
+
+    def state(self, state):
+        """(district, stage, competency) view of one state's districts."""
+        return self.cube[self.state_ranges[state]]
+
+    def districts(self, state=None):
+        """District labels, optionally for one state, in cube order."""
+        labels = self.index['districts']
+        if state is None:
+            return labels
+        return labels[self.state_ranges[state]]
+
+    def stage_means(self):
+        """Mean over competencies per (district, stage)."""
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return np.nanmean(self.cube, axis=2)
+
+def main():
+    if len(sys.argv) > 2:
+        print("Usage: python score_cube.py [csv_file]")
+        sys.exit(1)
+    csv_file = sys.argv[1] if len(sys.argv) == 2 else INPUT_FILE
+
+    df = pd.read_csv(csv_file, usecols=['State', 'District', 'Stage', 'Competency_Code', 'Score_Percent'])
+    cube, index = build_cube(df)
+    save_cube(cube, index)
+
+    filled = int(np.count_nonzero(~np.isnan(cube)))
+    print(f"✓ Saved {CUBE_FILE}: shape {cube.shape}, {cube.nbytes / 1e6:.1f} MB, "
+          f"{filled:,} of {cube.size:,} cells filled")
+    print(f"  Index saved to {INDEX_FILE}")
+
+if __name__ == "__main__":
+    start_from_argv()
+    main()
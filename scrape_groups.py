@@ -5,8 +5,17 @@ Based on scrape_parakh_angular.py that created all_results_complete.json
 """
 import asyncio
 import json
+import os
+import socket
 import sys
+import time
 from playwright.async_api import async_playwright
+from compact_results import CompactResults
+from area_frontier import load_areas, build_frontier, area_parents
+from work_queue import open_queue, QUEUE_FILE
+from competency_catalog import CompetencyCatalog
+from scrape_progress import ScrapeProgress
+from profiling import start_from_argv
 
 # States to scrape in groups
 STATE_GROUPS = {
@@ -87,6 +96,16 @@ async def get_competency_dropdowns(frame):
         }
     ''')
 
+async def get_dropdown_fingerprint(frame):
+    """Cheap [index, option count, text length] per dropdown, for catalog lookups."""
+    return await frame.evaluate('''
+        () => Array.from(document.querySelectorAll(".custom-dropdown-list")).map((dropdown, idx) => [
+            idx,
+            dropdown.querySelectorAll(".tree-view-node .node-item").length,
+            dropdown.textContent.length
+        ])
+    ''')
+
 async def select_competency(frame, dropdown_info, option_text):
     """Select a competency from dropdown."""
     return await frame.evaluate('''
@@ -143,8 +162,70 @@ async def get_chart_data(frame):
         }
     ''')
 
-async def scrape_state_stage(page, state_code, state_name, stage_key, stage_name):
-    """Scrape all competencies for a state and stage."""
+async def get_chart_deltas(frame):
+    """Extract only charts that changed since the last call on this page.
+
+    A signature hash per chart is kept in the page (reset on navigation), so
+    unchanged charts never cross the CDP boundary, and points carry only
+    name/y. Returns (changed_charts, total_charts).
+    """
+    result = await frame.evaluate('''
+        () => {
+            if (typeof Highcharts === 'undefined') return {total: 0, charts: []};
+            const seen = window.__parakhChartHashes || (window.__parakhChartHashes = {});
+            const fnv1a = (str) => {
+                let h = 0x811c9dc5;
+                for (let i = 0; i < str.length; i++) {
+                    h ^= str.charCodeAt(i);
+                    h = Math.imul(h, 0x01000193);
+                }
+                return h >>> 0;
+            };
+            const charts = Highcharts.charts.filter(c => c);
+            const changed = [];
+            charts.forEach(chart => {
+                const title = chart.title ? chart.title.textStr : '';
+                const parts = [title];
+                (chart.series || []).forEach(s => {
+                    parts.push(s.name, s.data ? s.data.length : 0);
+                    (s.data || []).forEach(d => parts.push(d.y));
+                });
+                const signature = fnv1a(parts.join('|'));
+                if (seen[chart.index] === signature) return;
+                seen[chart.index] = signature;
+                changed.push({
+                    title: title,
+                    series: chart.series ? chart.series.map(s => ({
+                        name: s.name,
+                        data: s.data ? s.data.map(d => ({name: d.name || d.category, y: d.y})) : []
+                    })) : []
+                });
+            });
+            return {total: charts.length, charts: changed};
+        }
+    ''')
+    return result['charts'], result['total']
+
+async def scrape_state_stage(page, state_code, state_name, stage_key, stage_name, store=None,
+                             only_codes=None, catalog=None, delta=False, progress=None,
+                             parent=None):
+    """Scrape all competencies for a state and stage.
+
+    With a CompactResults `store`, points are added to it instead of being
+    returned as dicts, once the whole unit has succeeded (like list mode, a
+    unit that fails partway contributes nothing). With `only_codes`, only dropdown options for those
+    competency codes are selected. With a CompetencyCatalog, the dropdown
+    options are taken from the catalog when the page fingerprint matches.
+    With `delta`, only charts that changed since the previous competency are
+    extracted. A ScrapeProgress is updated per competency and per unit.
+
+    For a district-level dashboard, `parent` is its (state_code, state_name):
+    records are labelled with the parent state and carry area_code/area.
+    """
+    record_state, record_code, area = state_name, state_code, None
+    if parent is not None:
+        record_code, record_state = parent
+        area = (state_code, state_name)
     url = f"https://dashboard.parakh.ncert.gov.in/en/dashboard/{state_code}?tab={stage_key}"
     print(f"\n  {state_name} - {stage_name}...")
     
@@ -161,21 +242,48 @@ async def scrape_state_stage(page, state_code, state_name, stage_key, stage_name
         
         if not dashboard_frame:
             print(f"    No dashboard iframe")
+            if progress is not None:
+                progress.end_unit(ok=False)
             return []
         
         results = []
-        dropdowns = await get_competency_dropdowns(dashboard_frame)
-        print(f"    Found {len(dropdowns)} dropdowns")
+        points = []
+        collected = 0
+        charts_seen = charts_sent = 0
+        dropdowns = None
+        if catalog is not None:
+            fingerprint = await get_dropdown_fingerprint(dashboard_frame)
+            dropdowns = catalog.lookup(stage_key, fingerprint)
+        if dropdowns is None:
+            dropdowns = await get_competency_dropdowns(dashboard_frame)
+            if catalog is not None:
+                catalog.learn(stage_key, fingerprint, dropdowns, source=state_code)
+            print(f"    Found {len(dropdowns)} dropdowns")
+        else:
+            print(f"    Found {len(dropdowns)} dropdowns (catalog)")
+        
+        if progress is not None:
+            progress.begin_unit(state_name, stage_name, sum(
+                1 for dd in dropdowns for o in dd['options']
+                if only_codes is None or o.split()[0] in only_codes))
         
         for dd in dropdowns:
             options = dd['options']
+            if only_codes is not None:
+                options = [o for o in options if o.split()[0] in only_codes]
             for option_text in options:
+                started, collected_before = time.perf_counter(), collected
                 success = await select_competency(dashboard_frame, dd, option_text)
                 if not success:
                     continue
                 
                 await asyncio.sleep(2)
-                charts = await get_chart_data(dashboard_frame)
+                if delta:
+                    charts, total = await get_chart_deltas(dashboard_frame)
+                    charts_seen += total
+                    charts_sent += len(charts)
+                else:
+                    charts = await get_chart_data(dashboard_frame)
                 
                 for chart in charts:
                     title = chart.get('title', '')
@@ -187,7 +295,7 @@ async def scrape_state_stage(page, state_code, state_name, stage_key, stage_name
                         if len(series_data) <= 2:
                             continue
                         
-                        for point in series_data:
+                        for i, point in enumerate(series_data):
                             # Handle point.name being either string or dict
                             district_name = point.get('name', '')
                             if isinstance(district_name, dict):
@@ -198,8 +306,15 @@ async def scrape_state_stage(page, state_code, state_name, stage_key, stage_name
                             score = point.get('y')
                             
                             if district_name and score is not None:
-                                results.append({
-                                    'state': state_name,
+                                collected += 1
+                                if store is not None:
+                                    points.append((record_state, stage_name, option_text.split()[0], title,
+                                                   series.get('name', ''), district_name, score, point.get('x', i),
+                                                   record_code, area))
+                                    continue
+                                record = {
+                                    'state': record_state,
+                                    'state_code': record_code,
                                     'stage': stage_name,
                                     'competency_code': option_text.split()[0],
                                     'chart_title': title,
@@ -207,65 +322,215 @@ async def scrape_state_stage(page, state_code, state_name, stage_key, stage_name
                                     'data': [{
                                         'name': {'userOptions': district_name, 'name': district_name, 'parent': None},
                                         'y': score,
-                                        'x': point.get('x', 0)
+                                        'x': point.get('x', i)
                                     }]
-                                })
+                                }
+                                if area:
+                                    record['area_code'], record['area'] = area
+                                results.append(record)
+                
+                if progress is not None:
+                    progress.competency_done(time.perf_counter() - started, collected - collected_before)
         
-        print(f"    Collected {len(results)} records")
+        if delta:
+            print(f"    Collected {collected} records ({charts_sent}/{charts_seen} charts transferred)")
+        else:
+            print(f"    Collected {collected} records")
+        for point in points:
+            store.add(*point)
+        if progress is not None:
+            progress.end_unit(ok=collected > 0)
         return results
         
     except Exception as e:
         print(f"    Error: {e}")
+        if progress is not None:
+            progress.end_unit(ok=False)
         return []
 
-async def scrape_group(group_num):
-    """Scrape a group of states."""
-    if group_num not in STATE_GROUPS:
-        print(f"Invalid group. Use 1-6")
-        return
+async def scrape_group(group_num, compact=False, chunk_size=5000, states=None, delta=False,
+                       status_port=None, parents=None):
+    """Scrape a group of states.
+
+    In compact mode results are kept in a CompactResults store that spills to
+    disk every `chunk_size` points, keeping peak memory bounded. `states`
+    overrides the STATE_GROUPS lookup (used for discovered areas), and
+    `parents` maps district-level area codes to their (state_code, state_name). `delta`
+    uses get_chart_deltas instead of get_chart_data. Progress is written to
+    scrape_status.group{N}.json and, with `status_port`, served over HTTP.
+    """
+    if states is None:
+        if group_num not in STATE_GROUPS:
+            print(f"Invalid group. Use 1-6 or 'all'")
+            return
+        states = STATE_GROUPS[group_num]
     
-    states = STATE_GROUPS[group_num]
     print(f"\n{'='*60}")
     print(f"GROUP {group_num}: {', '.join(states.values())}")
     print(f"{'='*60}")
     
     all_results = []
+    filename = f'group{group_num}_results.json'
+    store = CompactResults(f'{filename}.spill', chunk_size) if compact else None
+    catalog = CompetencyCatalog()
+    progress = ScrapeProgress(len(states) * len(STAGES), label=f'group {group_num}',
+                              status_file=f'scrape_status.group{group_num}.json')
+    reporter = asyncio.create_task(progress.report(port=status_port))
+    
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+            page.set_default_timeout(90000)
+            
+            for state_code, state_name in states.items():
+                print(f"\n{state_name} ({state_code})")
+                
+                for stage_key, stage_name in STAGES.items():
+                    results = await scrape_state_stage(page, state_code, state_name, stage_key, stage_name, store,
+                                                       catalog=catalog, delta=delta, progress=progress,
+                                                       parent=(parents or {}).get(state_code))
+                    all_results.extend(results)
+                
+                await asyncio.sleep(2)
+            
+            await browser.close()
+        
+        reporter.cancel()
+        progress.finish()
+        print(f"\nCompetency catalog: {catalog.hits} hits, {catalog.misses} enumerations")
+        
+        # Save to JSON
+        if store is not None:
+            if len(store):
+                count = store.write_json(filename)
+                print(f"\n✓ Saved {count} records to {filename}")
+            else:
+                print(f"\n✗ No data found for group {group_num}")
+        elif all_results:
+            with open(filename, 'w') as f:
+                json.dump(all_results, f, indent=2)
+            print(f"\n✓ Saved {len(all_results)} records to {filename}")
+        else:
+            print(f"\n✗ No data found for group {group_num}")
+    finally:
+        if store is not None:
+            store.close()
+
+async def discover_states(include_districts=False):
+    """Areas to crawl from the cached getArea hierarchy, in frontier order.
+
+    Returns ({code: name}, {district_code: (state_code, state_name)}).
+    """
+    areas = await load_areas()
+    frontier = build_frontier(areas, include_districts=include_districts)
+    states = {}
+    while frontier:
+        area = frontier.pop()
+        states[area['code']] = area['name']
+    return states, area_parents(areas)
+
+async def heartbeat(queue, unit_id, worker_id, lost):
+    """Keep a lease alive while its unit is being scraped."""
+    while True:
+        await asyncio.sleep(queue.visibility_timeout / 3)
+        if not queue.heartbeat(unit_id, worker_id):
+            lost.set()
+            return
+
+async def run_worker(queue_file=QUEUE_FILE, delta=False, status_port=None):
+    """Lease (state, stage) units from the shared queue until it is empty.
+
+    `queue_file` is a local SQLite queue or the http:// URL of `work_queue.py serve`.
+    """
+    queue = open_queue(queue_file)
+    catalog = CompetencyCatalog()
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    print(f"Worker {worker_id} using {queue_file}")
+    progress = ScrapeProgress(0, label=f'worker {worker_id}',
+                              status_file=f'scrape_status.{worker_id}.json', queue=queue)
+    reporter = asyncio.create_task(progress.report(port=status_port))
     
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
         page = await browser.new_page()
         page.set_default_timeout(90000)
         
-        for state_code, state_name in states.items():
-            print(f"\n{state_name} ({state_code})")
+        while True:
+            unit = queue.lease(worker_id)
+            if unit is None:
+                # Other workers' leases may still expire and come back
+                if not queue.outstanding():
+                    break
+                await asyncio.sleep(queue.visibility_timeout / 10)
+                continue
             
-            for stage_key, stage_name in STAGES.items():
-                results = await scrape_state_stage(page, state_code, state_name, stage_key, stage_name)
-                all_results.extend(results)
+            lost = asyncio.Event()
+            beat = asyncio.create_task(heartbeat(queue, unit['id'], worker_id, lost))
+            try:
+                results = await scrape_state_stage(page, unit['state_code'], unit['state'],
+                                                   unit['stage_key'], unit['stage'], catalog=catalog,
+                                                   delta=delta, progress=progress)
+            finally:
+                beat.cancel()
+            
+            if lost.is_set():
+                print(f"    Lease lost for {unit['state']} - {unit['stage']}, discarding")
+            elif results:
+                queue.complete(unit['id'], worker_id, results)
+            else:
+                # scrape_state_stage returns [] on errors, so retry empty units
+                queue.fail(unit['id'], worker_id, 'no records collected')
             
             await asyncio.sleep(2)
         
         await browser.close()
     
-    # Save to JSON
-    if all_results:
-        filename = f'group{group_num}_results.json'
-        with open(filename, 'w') as f:
-            json.dump(all_results, f, indent=2)
-        print(f"\n✓ Saved {len(all_results)} records to {filename}")
-    else:
-        print(f"\n✗ No data found for group {group_num}")
+    reporter.cancel()
+    progress.finish()
+    print(f"\nQueue drained: {queue.status()}")
 
 async def main():
-    if len(sys.argv) != 2:
-        print("Usage: python scrape_groups.py <group_number>")
+    args = sys.argv[1:]
+    delta = '--delta' in args
+    args = [a for a in args if a != '--delta']
+    status_port = None
+    if '--status-port' in args:
+        i = args.index('--status-port')
+        status_port = int(args[i + 1])
+        del args[i:i + 2]
+    if args and args[0] == 'worker':
+        await run_worker(args[1] if len(args) > 1 else QUEUE_FILE, delta=delta, status_port=status_port)
+        return
+    
+    include_districts = '--districts' in args
+    args = [a for a in args if a != '--districts']
+    compact = '--compact' in args
+    chunk_size = 5000
+    if '--chunk-size' in args:
+        chunk_size = int(args[args.index('--chunk-size') + 1])
+        del args[args.index('--chunk-size'):args.index('--chunk-size') + 2]
+    args = [a for a in args if a != '--compact']
+    
+    if len(args) != 1:
+        print("Usage: python scrape_groups.py <group_number|all> [--districts] [--compact] [--chunk-size N] [--delta]")
+        print("       python scrape_groups.py worker [queue_db | http://host:8767] [--delta]")
+        print("       any mode: [--status-port N] to serve progress JSON")
         print("\nAvailable groups:")
         for num, states in STATE_GROUPS.items():
             print(f"  Group {num}: {', '.join(states.values())}")
+        print("  all: every area from getArea (--districts adds district dashboards)")
+        return
+    
+    if args[0] == 'all':
+        states, parents = await discover_states(include_districts)
+        await scrape_group('all', compact=compact, chunk_size=chunk_size, states=states, delta=delta,
+                           status_port=status_port, parents=parents)
         return
     
-    group_num = int(sys.argv[1])
-    await scrape_group(group_num)
+    group_num = int(args[0])
+    await scrape_group(group_num, compact=compact, chunk_size=chunk_size, delta=delta, status_port=status_port)
 
 if __name__ == "__main__":
+    start_from_argv()
     asyncio.run(main())
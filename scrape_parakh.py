@@ -8,6 +8,7 @@ import csv
 import re
 from playwright.async_api import async_playwright
 from datetime import datetime
+from profiling import start_from_argv
 
 # Target states with their codes
 STATES = {
@@ -311,4 +312,5 @@ async def main():
     print(f"\nCollected data for {len(results)} state-stage combinations")
 
 if __name__ == "__main__":
+    start_from_argv()
     asyncio.run(main())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Live progress for scrape_groups.py runs.
+
+ScrapeProgress tracks (state, stage) units and the competencies inside them:
+completed and pending units, rolling throughput over the last WINDOW_SECONDS,
+per-competency latency percentiles, ETA, and stalls (no competency finished
+for STALL_SECONDS). In worker mode, queue depth comes from the shared work
+queue.
+
+While a scrape runs, a status line is printed every REPORT_INTERVAL seconds
+and the full snapshot is written to the run's own status file
+(scrape_status.group<N>.json, scrape_status.<worker>.json), so parallel runs
+never share one. Writing status is best effort: a failed write is reported
+and never interrupts the scrape. With --status-port the snapshot is also
+served as JSON on http://127.0.0.1:<port>/. Running this script renders
+either source as a refreshing terminal view; with no source it follows the
+most recently updated status file.
+
+Usage:
+    python scrape_progress.py [status_file | http://127.0.0.1:8766/] [--interval 2]
+"""
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+import urllib.request
+from collections import deque
+from datetime import datetime
+from profiling import start_from_argv
+
+STATUS_FILE = 'scrape_status.json'
+WINDOW_SECONDS = 300
+LATENCY_SAMPLES = 500
+STALL_SECONDS = 120
+REPORT_INTERVAL = 30
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+def format_duration(seconds):
+    if seconds is None:
+        return '?'
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    return f"{hours}h{rest // 60:02d}m" if hours else f"{rest // 60}m{rest % 60:02d}s"
+
+class ScrapeProgress:
+    """Counters, rolling rates and ETA for one scrape run."""
+
+    def __init__(self, total_units, label='', status_file=STATUS_FILE, queue=None):
+        self.label = label
+        self.total_units = total_units
+        self.status_file = status_file
+        self.queue = queue
+        self.started = time.time()
+        self.last_progress = self.started
+        self.done_units = 0
+        self.failed_units = 0
+        self.competencies_done = 0
+        self.records = 0
+        self.options_per_unit = []
+        self.current = None
+        self.competency_times = deque()
+        self.unit_times = deque()
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.finished = False
+
+    def begin_unit(self, state, stage, options):
+        self.current = {'state': state, 'stage': stage, 'options': options, 'done': 0,
+                        'started': time.time()}
+
+    def competency_done(self, latency, records):
+        now = time.time()
+        self.competencies_done += 1
+        self.records += records
+        self.latencies.append(latency)
+        self.competency_times.append(now)
+        self.last_progress = now
+        if self.current:
+            self.current['done'] += 1
+
+    def end_unit(self, ok=True):
+        if ok:
+            self.done_units += 1
+        else:
+            self.failed_units += 1
+        if self.current:
+            self.options_per_unit.append(self.current['options'])
+        self.current = None
+        self.unit_times.append(time.time())
+        self.write_status()
+
+    def rate_per_minute(self, times, now):
+        """Events per minute over the rolling window."""
+        while times and times[0] < now - WINDOW_SECONDS:
+            times.popleft()
+        span = min(WINDOW_SECONDS, now - self.started)
+        return len(times) / span * 60 if span > 0 else 0.0
+
+    def unit_counts(self):
+        """(total, done, failed, pending) units, from the queue in worker mode."""
+        if self.queue is not None:
+            counts = self.queue.status()
+            pending = counts.get('pending', 0) + counts.get('leased', 0)
+            return sum(counts.values()), counts.get('done', 0), counts.get('failed', 0), pending
+        pending = self.total_units - self.done_units - self.failed_units
+        return self.total_units, self.done_units, self.failed_units, pending
+
+    def snapshot(self):
+        now = time.time()
+        total, done, failed, pending = self.unit_counts()
+        comp_rate = self.rate_per_minute(self.competency_times, now)
+        unit_rate = self.rate_per_minute(self.unit_times, now)
+
+        # Remaining competencies: what is left of the current unit plus the
+        # average options per unit for every other pending unit
+        eta = None
+        if self.options_per_unit or self.current:
+            known = self.options_per_unit + ([self.current['options']] if self.current else [])
+            per_unit = sum(known) / len(known)
+            remaining = per_unit * max(pending - (1 if self.current else 0), 0)
+            if self.current:
+                remaining += self.current['options'] - self.current['done']
+            if comp_rate > 0:
+                eta = remaining / comp_rate * 60
+
+        latencies = sorted(self.latencies)
+        since_progress = now - self.last_progress
+        return {
+            'label': self.label,
+            'updated': datetime.now().isoformat(timespec='seconds'),
+            'elapsed_seconds': round(now - self.started, 1),
+            'finished': self.finished,
+            'units': {'total': total, 'done': done, 'failed': failed, 'pending': pending},
+            'current': None if self.current is None else {
+                k: self.current[k] for k in ('state', 'stage', 'options', 'done')},
+            'competencies_done': self.competencies_done,
+            'records': self.records,
+            'competencies_per_minute': round(comp_rate, 2),
+            'units_per_minute': round(unit_rate, 3),
+            'latency_seconds': {f'p{p}': None if not latencies else round(percentile(latencies, p), 2)
+                                for p in (50, 90, 99)},
+            'eta_seconds': None if eta is None else round(eta),
+            'seconds_since_progress': round(since_progress, 1),
+            'stalled': not self.finished and since_progress > STALL_SECONDS
+        }
+
+    def write_status(self, snapshot=None):
+        if not self.status_file:
+            return
+        tmp = f"{self.status_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(snapshot or self.snapshot(), f, indent=2)
+            os.replace(tmp, self.status_file)
+        except Exception as e:
+            # Progress reporting must never cost the scrape its results
+            print(f"  [progress] could not write {self.status_file}: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    async def serve_client(self, reader, writer):
+        try:
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            body = json.dumps(self.snapshot(), indent=2).encode()
+            writer.write(("HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode() + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def report(self, interval=REPORT_INTERVAL, port=None):
+        """Print a status line and refresh the status file until cancelled."""
+        server = None
+        if port:
+            server = await asyncio.start_server(self.serve_client, '127.0.0.1', port)
+            print(f"Progress on http://127.0.0.1:{port}/")
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                snapshot = self.snapshot()
+                self.write_status(snapshot)
+                print(status_line(snapshot))
+        finally:
+            if server is not None:
+                server.close()
+
+    def finish(self):
+        self.finished = True
+        snapshot = self.snapshot()
+        self.write_status(snapshot)
+        print(status_line(snapshot))
+
+def status_line(s):
+    units = s['units']
+    lat = s['latency_seconds']
+    line = (f"  [progress] units {units['done']}/{units['total']} ({units['pending']} pending, "
+            f"{units['failed']} failed) | {s['competencies_per_minute']:.1f} comp/min | "
+            f"p50 {lat['p50']}s p90 {lat['p90']}s | ETA {format_duration(s['eta_seconds'])}")
+    if s['stalled']:
+        line += f" | ⚠ STALLED {format_duration(s['seconds_since_progress'])}"
+    return line
+
+def render(s):
+    """Full-screen view of one snapshot."""
+    units = s['units']
+    done = units['done'] + units['failed']
+    width = 40
+    filled = int(width * done / units['total']) if units['total'] else 0
+    lat = s['latency_seconds']
+    lines = [
+        f"PARAKH scrape {s['label']}  ({'finished' if s['finished'] else 'running'}, updated {s['updated']})",
+        "=" * 60,
+        f"Units       [{'#' * filled}{'.' * (width - filled)}] {done}/{units['total']}",
+        f"            {units['done']} done, {units['failed']} failed, {units['pending']} pending",
+        f"Current     " + (f"{s['current']['state']} - {s['current']['stage']} "
+                           f"({s['current']['done']}/{s['current']['options']} competencies)"
+                           if s['current'] else '-'),
+        f"Throughput  {s['competencies_per_minute']:.1f} competencies/min, "
+        f"{s['units_per_minute']:.2f} units/min (last {WINDOW_SECONDS // 60} min)",
+        f"Latency     p50 {lat['p50']}s  p90 {lat['p90']}s  p99 {lat['p99']}s per competency",
+        f"Collected   {s['competencies_done']:,} competencies, {s['records']:,} records",
+        f"Elapsed     {format_duration(s['elapsed_seconds'])}   ETA {format_duration(s['eta_seconds'])}",
+    ]
+    if s['stalled']:
+        lines.append(f"⚠ STALLED: no competency finished for {format_duration(s['seconds_since_progress'])}")
+    return '\n'.join(lines)
+
+def latest_status_file():
+    """Most recently updated status file in the current directory."""
+    files = glob.glob('scrape_status*.json')
+    return max(files, key=os.path.getmtime) if files else STATUS_FILE
+
+def read_status(source):
+    if source.startswith('http://') or source.startswith('https://'):
+        with urllib.request.urlopen(source, timeout=5) as response:
+            return json.load(response)
+    with open(source, 'r') as f:
+        return json.load(f)
+
+def main():
+    args = sys.argv[1:]
+    interval = 2.0
+    if '--interval' in args:
+        i = args.index('--interval')
+        interval = float(args[i + 1])
+        del args[i:i + 2]
+    if len(args) > 1:
+        print(__doc__.strip().split('Usage:')[1].rstrip())
+        sys.exit(1)
+    source = args[0] if args else latest_status_file()
+
+    while True:
+        try:
+            snapshot = read_status(source)
+        except (OSError, ValueError) as e:
+            print(f"Waiting for {source}: {e}")
+        else:
+            print('\033[2J\033[H' + render(snapshot), flush=True)
+            if snapshot['finished']:
+                break
+        time.sleep(interval)
+
+if __name__ == "__main__":
+    start_from_argv()
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Snapshot store and diff engine for parakh_competency_data_all.csv.
+
+A snapshot is a directory snapshots/<id>/ holding one CSV per (State, Stage)
+partition plus manifest.json with a content hash per partition. Diffing two
+snapshots compares manifests first, so identical partitions are skipped without
+being read; only changed partitions are loaded and merge-diffed.
+
+The change log has one row per (State, District, Stage, Competency_Code) that
+was added, removed or changed, with old/new score and delta.
+
+Usage:
+    python snapshot_diff.py save [csv_file]
+    python snapshot_diff.py list
+    python snapshot_diff.py diff [old_id new_id]
+"""
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+import pandas as pd
+from profiling import start_from_argv
+
+SNAPSHOT_DIR = 'snapshots'
+INPUT_FILE = 'parakh_competency_data_all.csv'
+
+KEY = ['State', 'District', 'Stage', 'Competency_Code']
+PARTITION = ['State', 'Stage']
+VALUE = 'Score_Percent'
+
+def partition_file(state, stage):
+    """File name for a (state, stage) partition."""
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', f"{state}__{stage}").strip('_')
+    return f"{slug}.csv"
+
+def partition_hashes(df):
+    """Order-independent content hash and row count per partition, in one pass."""
+    row_hash = pd.util.hash_pandas_object(df[KEY + [VALUE]], index=False)
+    grouped = row_hash.groupby([df[c] for c in PARTITION], observed=True)
+    summary = pd.DataFrame({'hash': grouped.sum(), 'rows': grouped.size()})
+    return {
+        (state, stage): {'hash': format(int(h) & 0xFFFFFFFFFFFFFFFF, '016x'), 'rows': int(rows)}
+        for (state, stage), h, rows in zip(summary.index, summary['hash'], summary['rows'])
+    }
+
+def list_snapshots():
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return []
+    return sorted(d for d in os.listdir(SNAPSHOT_DIR)
+                  if os.path.exists(os.path.join(SNAPSHOT_DIR, d, 'manifest.json')))
+
+def load_manifest(snapshot_id):
+    with open(os.path.join(SNAPSHOT_DIR, snapshot_id, 'manifest.json'), 'r') as f:
+        manifest = json.load(f)
+    return {tuple(p['key']): p for p in manifest['partitions']}
+
+def save_snapshot(csv_file=INPUT_FILE, snapshot_id=None):
+    """Partition the CSV into a new snapshot. Returns the snapshot id."""
+    df = pd.read_csv(csv_file)
+    snapshot_id = snapshot_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+    path = os.path.join(SNAPSHOT_DIR, snapshot_id)
+    os.makedirs(path, exist_ok=True)
+
+    hashes = partition_hashes(df)
+    partitions = []
+    for (state, stage), part in df.groupby(PARTITION, observed=True, sort=True):
+        filename = partition_file(state, stage)
+        part.to_csv(os.path.join(path, filename), index=False)
+        partitions.append({'key': [state, stage], 'file': filename, **hashes[(state, stage)]})
+
+    with open(os.path.join(path, 'manifest.json'), 'w') as f:
+        json.dump({'id': snapshot_id, 'source': csv_file, 'created': datetime.now().isoformat(),
+                   'rows': len(df), 'partitions': partitions}, f, indent=2)
+
+    print(f"✓ Saved snapshot {snapshot_id}: {len(df):,} rows, {len(partitions)} partitions")
+    return snapshot_id
+
+def load_partitions(snapshot_id, manifest, keys):
+    """Load only the given partitions of a snapshot."""
+    frames = [pd.read_csv(os.path.join(SNAPSHOT_DIR, snapshot_id, manifest[k]['file']))
+              for k in keys if k in manifest]
+    if not frames:
+        return pd.DataFrame(columns=KEY + [VALUE])
+    return pd.concat(frames, ignore_index=True)[KEY + [VALUE]]
+
+def diff_snapshots(old_id, new_id):
+    """Change log between two snapshots."""
+    old_manifest = load_manifest(old_id)
+    new_manifest = load_manifest(new_id)
+
+    changed = sorted(
+        k for k in set(old_manifest) | set(new_manifest)
+        if old_manifest.get(k, {}).get('hash') != new_manifest.get(k, {}).get('hash')
+        or old_manifest.get(k, {}).get('rows') != new_manifest.get(k, {}).get('rows')
+    )
+    print(f"Partitions: {len(set(old_manifest) | set(new_manifest))} total, {len(changed)} changed")
+    if not changed:
+        return pd.DataFrame(columns=KEY + ['Change', 'Old_Score', 'New_Score', 'Delta'])
+
+    old = load_partitions(old_id, old_manifest, changed)
+    new = load_partitions(new_id, new_manifest, changed)
+    return diff_frames(old, new)
+
+def diff_frames(old, new):
+    """Vectorized merge-diff of two long-format frames on KEY."""
+    merged = old.merge(new, on=KEY, how='outer', suffixes=('_old', '_new'), indicator=True)
+    merged = merged.rename(columns={f'{VALUE}_old': 'Old_Score', f'{VALUE}_new': 'New_Score'})
+
+    merged['Change'] = merged['_merge'].map({'left_only': 'removed', 'right_only': 'added',
+                                             'both': 'changed'}).astype(str)
+    merged['Delta'] = (merged['New_Score'] - merged['Old_Score']).round(2)
+    unchanged = (merged['_merge'] == 'both') & (
+        (merged['Old_Score'] == merged['New_Score'])
+        | (merged['Old_Score'].isna() & merged['New_Score'].isna()))
+
+    log = merged.loc[~unchanged, KEY + ['Change', 'Old_Score', 'New_Score', 'Delta']]
+    return log.sort_values(KEY).reset_index(drop=True)
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('save', 'list', 'diff'):
+        print(__doc__.strip().split('Usage:')[1].rstrip())
+        sys.exit(1)
+
+    command = args[0]
+    if command == 'save':
+        save_snapshot(args[1] if len(args) > 1 else INPUT_FILE)
+    elif command == 'list':
+        for snapshot_id in list_snapshots():
+            print(f"  {snapshot_id}")
+    elif command == 'diff':
+        if len(args) == 3:
+            old_id, new_id = args[1], args[2]
+        else:
+            snapshots = list_snapshots()
+            if len(snapshots) < 2:
+                print("Need at least 2 snapshots to diff")
+                sys.exit(1)
+            old_id, new_id = snapshots[-2], snapshots[-1]
+
+        log = diff_snapshots(old_id, new_id)
+        filename = f'changes_{old_id}_to_{new_id}.csv'
+        log.to_csv(filename, index=False)
+
+        counts = log['Change'].value_counts()
+        print(f"\n{'='*60}")
+        print(f"✓ {old_id} → {new_id}: {len(log):,} changes saved to {filename}")
+        for change in ['added', 'removed', 'changed']:
+            print(f"  {change}: {counts.get(change, 0):,}")
+        print(f"{'='*60}")
+
+if __name__ == "__main__":
+    start_from_argv()
+    main()
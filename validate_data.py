@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Data-quality validation for parakh_competency_data_all.csv.
+
+All rules run as whole-frame operations (no per-row loops):
+- coverage:   every state has every expected competency per stage, checked as a
+              State x (Stage, Competency_Code) matrix against COMPETENCY_SUBJECTS
+- scores:     Score_Percent is present and within 0-100
+- subjects:   Subject matches the competency mapping for the stage
+- duplicates: one row per (State, District, Stage, Competency_Code)
+- districts:  district counts per state match the previous run
+              (stored in validation_baseline.json)
+
+Writes a structured validation_report.json and exits non-zero on errors, so it
+can gate a pipeline run.
+"""
+import json
+import os
+import sys
+
+import pandas as pd
+
+from convert_group_to_csv import COMPETENCY_SUBJECTS
+from profiling import start_from_argv
+
+INPUT_FILE = 'parakh_competency_data_all.csv'
+REPORT_FILE = 'validation_report.json'
+BASELINE_FILE = 'validation_baseline.json'
+
+KEY = ['State', 'District', 'Stage', 'Competency_Code']
+
+def expected_catalog():
+    """Expected (Stage, Competency_Code, Subject) rows."""
+    return pd.DataFrame(
+        [(stage, code, subject)
+         for stage, codes in COMPETENCY_SUBJECTS.items()
+         for code, subject in codes.items()],
+        columns=['Stage', 'Competency_Code', 'Expected_Subject'])
+
+def check_coverage(df, catalog):
+    """Missing cells of the State x (Stage, Competency_Code) coverage matrix."""
+    present = df[['State', 'Stage', 'Competency_Code']].drop_duplicates()
+    state_stages = present[['State', 'Stage']].drop_duplicates()
+
+    # Every state should have every stage
+    all_stages = pd.MultiIndex.from_product([present['State'].unique(), list(COMPETENCY_SUBJECTS)],
+                                            names=['State', 'Stage']).to_frame(index=False)
+    stages = all_stages.merge(state_stages, how='left', indicator=True)
+    missing_stages = stages.loc[stages['_merge'] == 'left_only', ['State', 'Stage']]
+
+    # Every stage a state has should have every expected competency
+    expected = state_stages.merge(catalog[['Stage', 'Competency_Code']], on='Stage')
+    cells = expected.merge(present, how='left', indicator=True)
+    cells['Present'] = cells['_merge'] == 'both'
+    missing = cells.loc[~cells['Present'], ['State', 'Stage', 'Competency_Code']]
+
+    matrix = (cells.groupby(['State', 'Stage'])['Present']
+              .agg(Present='sum', Expected='size').reset_index())
+    matrix = matrix[matrix['Present'] < matrix['Expected']]
+
+    unexpected = present.merge(catalog[['Stage', 'Competency_Code']], how='left', indicator=True)
+    unexpected = unexpected.loc[unexpected['_merge'] == 'left_only', ['Stage', 'Competency_Code']]
+
+    return {
+        'missing_stages': missing_stages.to_dict('records'),
+        'missing_competencies': missing.to_dict('records'),
+        'incomplete_slices': matrix.to_dict('records'),
+        'unexpected_competencies': unexpected.drop_duplicates().to_dict('records')
+    }
+
+def check_scores(df):
+    """Scores missing or outside 0-100."""
+    scores = pd.to_numeric(df['Score_Percent'], errors='coerce')
+    missing = scores.isna()
+    out_of_range = ~missing & ((scores < 0) | (scores > 100))
+    return {
+        'missing': int(missing.sum()),
+        'out_of_range': int(out_of_range.sum()),
+        'out_of_range_rows': df.loc[out_of_range, KEY + ['Score_Percent']].head(50).to_dict('records')
+    }
+
+def check_subjects(df, catalog):
+    """Rows whose Subject disagrees with the competency mapping."""
+    merged = df[KEY + ['Subject']].merge(catalog, on=['Stage', 'Competency_Code'], how='left')
+    wrong = merged['Expected_Subject'].notna() & (merged['Subject'] != merged['Expected_Subject'])
+    mismatches = (merged.loc[wrong, ['Stage', 'Competency_Code', 'Subject', 'Expected_Subject']]
+                  .value_counts().reset_index(name='Rows'))
+    return {'mismatched_rows': int(wrong.sum()), 'mismatches': mismatches.to_dict('records')}
+
+def check_duplicates(df):
+    dupes = df.duplicated(subset=KEY, keep=False)
+    return {'duplicate_rows': int(dupes.sum()),
+            'examples': df.loc[dupes, KEY].head(20).to_dict('records')}
+
+def district_counts(df):
+    return {state: int(n) for state, n in df.groupby('State')['District'].nunique().items()}
+
+def check_districts(counts, baseline):
+    """States whose district count changed since the baseline run."""
+    changed = []
+    for state in sorted(set(counts) | set(baseline)):
+        old, new = baseline.get(state), counts.get(state)
+        if old != new:
+            changed.append({'State': state, 'Previous': old, 'Current': new})
+    return {'changed': changed}
+
+def validate(df, baseline=None):
+    """Run all rules and return a structured report."""
+    catalog = expected_catalog()
+    counts = district_counts(df)
+
+    report = {
+        'rows': len(df),
+        'states': int(df['State'].nunique()),
+        'coverage': check_coverage(df, catalog),
+        'scores': check_scores(df),
+        'subjects': check_subjects(df, catalog),
+        'duplicates': check_duplicates(df),
+        'districts': check_districts(counts, baseline) if baseline else {'changed': []},
+        'district_counts': counts
+    }
+
+    errors = []
+    if report['coverage']['missing_competencies']:
+        errors.append(f"{len(report['coverage']['missing_competencies'])} missing state/stage/competency cells")
+    if report['coverage']['missing_stages']:
+        errors.append(f"{len(report['coverage']['missing_stages'])} missing state/stage slices")
+    if report['scores']['missing'] or report['scores']['out_of_range']:
+        errors.append(f"{report['scores']['missing']} missing and "
+                      f"{report['scores']['out_of_range']} out-of-range scores")
+    if report['duplicates']['duplicate_rows']:
+        errors.append(f"{report['duplicates']['duplicate_rows']} duplicate key rows")
+
+    warnings = []
+    if report['subjects']['mismatched_rows']:
+        warnings.append(f"{report['subjects']['mismatched_rows']} rows with unexpected subject")
+    if report['coverage']['unexpected_competencies']:
+        warnings.append(f"{len(report['coverage']['unexpected_competencies'])} competencies not in mapping")
+    if report['districts']['changed']:
+        warnings.append(f"{len(report['districts']['changed'])} states changed district count")
+
+    report['errors'] = errors
+    report['warnings'] = warnings
+    report['passed'] = not errors
+    return report
+
+def print_summary(report):
+    print(f"\nValidation: {report['rows']:,} rows, {report['states']} states")
+    for error in report['errors']:
+        print(f"  ✗ {error}")
+    for warning in report['warnings']:
+        print(f"  ! {warning}")
+    if report['passed']:
+        print("  ✓ All checks passed")
+
+def run_validation(csv_file=INPUT_FILE, update_baseline=False, df=None):
+    """Validate a combined CSV (or an already loaded `df`), write the report and return it."""
+    if df is None:
+        df = pd.read_csv(csv_file)
+
+    baseline = None
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, 'r') as f:
+            baseline = json.load(f)
+
+    report = validate(df, baseline)
+    with open(REPORT_FILE, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+    print_summary(report)
+    print(f"  Report saved to {REPORT_FILE}")
+
+    if update_baseline and report['passed']:
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(report['district_counts'], f, indent=2)
+        print(f"  Baseline updated: {BASELINE_FILE}")
+    return report
+
+if __name__ == "__main__":
+    start_from_argv()
+    args = sys.argv[1:]
+    update = '--update-baseline' in args
+    args = [a for a in args if a != '--update-baseline']
+    if len(args) > 1:
+        print("Usage: python validate_data.py [csv_file] [--update-baseline]")
+        sys.exit(1)
+    report = run_validation(args[0] if args else INPUT_FILE, update_baseline=update)
+    sys.exit(0 if report['passed'] else 1)
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed work queue and result store for distributed scraping.
+
+Work units are (state, stage) pairs. Workers (python scrape_groups.py worker)
+lease a unit with a visibility timeout and heartbeat while scraping it. If a
+worker crashes, its lease expires and the unit is handed to another worker.
+Results are written to the same database file, which acts as the shared
+result store.
+
+The SQLite file is only opened on the host that holds it: WAL mode needs
+shared memory between the processes, and SQLite locking is not reliable over
+NFS/SMB, so never point workers at a network copy of the file. To scale out
+across hosts, run `serve` next to the database. It exposes lease, heartbeat,
+complete, fail, outstanding and status over HTTP, and workers on any host
+connect by URL (python scrape_groups.py worker http://host:8767). The server
+has no authentication, so only expose it on a trusted network.
+
+Usage:
+    python work_queue.py enqueue <group_number|all> [...]
+    python work_queue.py status
+    python work_queue.py export [json_file]
+    python work_queue.py serve [--host 0.0.0.0] [--port 8767]
+"""
+import asyncio
+import json
+import sqlite3
+import sys
+import time
+import urllib.error
+import urllib.request
+from profiling import start_from_argv
+
+QUEUE_FILE = 'work_queue.db'
+VISIBILITY_TIMEOUT = 600
+MAX_ATTEMPTS = 3
+QUEUE_PORT = 8767
+REQUEST_RETRIES = 5
+
+# WorkQueue methods workers may call over HTTP
+REMOTE_METHODS = ('lease', 'heartbeat', 'complete', 'fail', 'outstanding', 'status')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    state_code TEXT NOT NULL,
+    state TEXT NOT NULL,
+    stage_key TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    UNIQUE (state_code, stage_key)
+);
+CREATE TABLE IF NOT EXISTS results (
+    unit_id INTEGER PRIMARY KEY REFERENCES units(id),
+    worker TEXT NOT NULL,
+    records INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    completed_at REAL NOT NULL
+);
+"""
+
+class WorkQueue:
+    """Lease-based queue of (state, stage) units in a SQLite file."""
+
+    def __init__(self, path=QUEUE_FILE, visibility_timeout=VISIBILITY_TIMEOUT):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def enqueue(self, state_code, state, stage_key, stage):
+        """Add a unit; re-enqueueing a finished or failed unit resets it."""
+        self.conn.execute(
+            """INSERT INTO units (state_code, state, stage_key, stage) VALUES (?, ?, ?, ?)
+               ON CONFLICT (state_code, stage_key) DO UPDATE SET
+                   status = CASE WHEN status = 'leased' THEN status ELSE 'pending' END,
+                   attempts = CASE WHEN status = 'leased' THEN attempts ELSE 0 END""",
+            (state_code, state, stage_key, stage))
+
+    def lease(self, worker):
+        """Lease the next pending (or expired) unit. Returns a dict or None."""
+        now = time.time()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Expired leases go back to pending, or fail after MAX_ATTEMPTS
+            self.conn.execute(
+                """UPDATE units SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                       error = COALESCE(error, 'lease expired'), lease_owner = NULL
+                   WHERE status = 'leased' AND lease_expires < ?""", (MAX_ATTEMPTS, now))
+            row = self.conn.execute(
+                """SELECT id, state_code, state, stage_key, stage, attempts FROM units
+                   WHERE status = 'pending' ORDER BY attempts, id LIMIT 1""").fetchone()
+            if row is None:
+                self.conn.execute('COMMIT')
+                return None
+            self.conn.execute(
+                """UPDATE units SET status = 'leased', lease_owner = ?, lease_expires = ?,
+                       attempts = attempts + 1 WHERE id = ?""",
+                (worker, now + self.visibility_timeout, row[0]))
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        keys = ['id', 'state_code', 'state', 'stage_key', 'stage', 'attempts']
+        unit = dict(zip(keys, row))
+        unit['attempts'] += 1
+        return unit
+
+    def heartbeat(self, unit_id, worker):
+        """Extend a lease. Returns False if the lease was lost."""
+        cur = self.conn.execute(
+            """UPDATE units SET lease_expires = ?
+               WHERE id = ? AND lease_owner = ? AND status = 'leased'""",
+            (time.time() + self.visibility_timeout, unit_id, worker))
+        return cur.rowcount == 1
+
+    def complete(self, unit_id, worker, results):
+        """Store results and mark the unit done, if the lease is still ours."""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            owner = self.conn.execute(
+                "SELECT lease_owner FROM units WHERE id = ? AND status = 'leased'", (unit_id,)).fetchone()
+            if not owner or owner[0] != worker:
+                self.conn.execute('ROLLBACK')
+                return False
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (unit_id, worker, len(results), json.dumps(results), time.time()))
+            self.conn.execute(
+                "UPDATE units SET status = 'done', lease_owner = NULL, error = NULL WHERE id = ?",
+                (unit_id,))
+            self.conn.execute('COMMIT')
+            return True
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+
+    def fail(self, unit_id, worker, error):
+        """Release a lease after an error so the unit can be retried."""
+        self.conn.execute(
+            """UPDATE units SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                   lease_owner = NULL, error = ?
+               WHERE id = ? AND lease_owner = ?""",
+            (MAX_ATTEMPTS, str(error), unit_id, worker))
+
+    def outstanding(self):
+        """Units still pending or leased by some worker."""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM units WHERE status IN ('pending', 'leased')").fetchone()[0]
+
+    def status(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM units GROUP BY status").fetchall())
+
+    def iter_results(self):
+        for (payload,) in self.conn.execute(
+                "SELECT r.payload FROM results r JOIN units u ON u.id = r.unit_id ORDER BY u.id"):
+            yield from json.loads(payload)
+
+class HttpWorkQueue:
+    """Client for a queue served by `work_queue.py serve`, with the worker side of WorkQueue."""
+
+    def __init__(self, url, retries=REQUEST_RETRIES):
+        self.url = url.rstrip('/')
+        self.retries = retries
+        self.visibility_timeout = self.request('')['visibility_timeout']
+
+    def request(self, path, body=None):
+        """GET (no body) or POST JSON, retrying connection errors with backoff."""
+        data = None if body is None else json.dumps(body).encode()
+        for attempt in range(self.retries):
+            req = urllib.request.Request(f"{self.url}/{path}", data=data,
+                                         headers={'Content-Type': 'application/json'})
+            try:
+                with urllib.request.urlopen(req, timeout=60) as response:
+                    return json.load(response)
+            except urllib.error.HTTPError as e:
+                raise RuntimeError(f"Queue {path or 'info'} failed: {e.code} {e.read().decode(errors='replace')}")
+            except OSError as e:
+                if attempt == self.retries - 1:
+                    raise
+                print(f"  Queue {self.url} unreachable ({e}), retrying")
+                time.sleep(2 ** attempt)
+
+    def call(self, method, **kwargs):
+        return self.request(method, kwargs)['result']
+
+    def lease(self, worker):
+        return self.call('lease', worker=worker)
+
+    def heartbeat(self, unit_id, worker):
+        return self.call('heartbeat', unit_id=unit_id, worker=worker)
+
+    def complete(self, unit_id, worker, results):
+        return self.call('complete', unit_id=unit_id, worker=worker, results=results)
+
+    def fail(self, unit_id, worker, error):
+        return self.call('fail', unit_id=unit_id, worker=worker, error=str(error))
+
+    def outstanding(self):
+        return self.call('outstanding')
+
+    def status(self):
+        return self.call('status')
+
+def open_queue(location=QUEUE_FILE):
+    """WorkQueue for a local file, or HttpWorkQueue for an http(s):// URL."""
+    if location.startswith('http://') or location.startswith('https://'):
+        return HttpWorkQueue(location)
+    return WorkQueue(location)
+
+def serve(queue, host='127.0.0.1', port=QUEUE_PORT):
+    """Serve `queue` over HTTP. Requests are handled one at a time, on the queue's connection."""
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def reply(self, code, body):
+            data = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self.reply(200, {'visibility_timeout': queue.visibility_timeout, 'status': queue.status()})
+
+        def do_POST(self):
+            method = self.path.strip('/')
+            if method not in REMOTE_METHODS:
+                self.reply(404, {'error': f"unknown method: {method}"})
+                return
+            try:
+                kwargs = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                result = getattr(queue, method)(**kwargs)
+            except (ValueError, TypeError) as e:
+                self.reply(400, {'error': str(e)})
+            except sqlite3.Error as e:
+                self.reply(500, {'error': str(e)})
+            else:
+                self.reply(200, {'result': result})
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer((host, port), Handler)
+    print(f"Serving {queue.path} on http://{host}:{port}/ ({queue.status()})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+def enqueue_groups(queue, groups):
+    """Enqueue every (state, stage) of the given groups ('all' discovers areas)."""
+    from scrape_groups import STATE_GROUPS, STAGES, discover_states
+
+    states = {}
+    for group in groups:
+        if group == 'all':
+            states.update(asyncio.run(discover_states())[0])
+        else:
+            states.update(STATE_GROUPS[int(group)])
+
+    for state_code, state_name in states.items():
+        for stage_key, stage_name in STAGES.items():
+            queue.enqueue(state_code, state_name, stage_key, stage_name)
+    return len(states) * len(STAGES)
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('enqueue', 'status', 'export', 'serve'):
+        print(__doc__.strip().split('Usage:')[1].rstrip())
+        sys.exit(1)
+
+    queue = WorkQueue()
+    command = args[0]
+    if command == 'enqueue':
+        count = enqueue_groups(queue, args[1:])
+        print(f"✓ Enqueued {count} units in {QUEUE_FILE}")
+    elif command == 'status':
+        for status, count in sorted(queue.status().items()):
+            print(f"  {status}: {count}")
+        for row in queue.conn.execute(
+                "SELECT state, stage, attempts, error FROM units WHERE status = 'failed'"):
+            print(f"  ✗ {row[0]} - {row[1]} after {row[2]} attempts: {row[3]}")
+    elif command == 'export':
+        filename = args[1] if len(args) > 1 else 'groupqueue_results.json'
+        results = list(queue.iter_results())
+        with open(filename, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"✓ Saved {len(results)} records to {filename}")
+    elif command == 'serve':
+        host, port = '127.0.0.1', QUEUE_PORT
+        if '--host' in args:
+            host = args[args.index('--host') + 1]
+        if '--port' in args:
+            port = int(args[args.index('--port') + 1])
+        try:
+            serve(queue, host, port)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    start_from_argv()
+    main()